@@ -76,7 +76,7 @@ echo   Building greedy_algorithm_seam_carving.exe...
 .\python_portable\python.exe -m PyInstaller --onefile --collect-data cv2 greedy_algorithm_seam_carving.py >> %LOGFILE% 2>&1
 
 echo   Building graph_cut_seam_carving.exe...
-.\python_portable\python.exe -m PyInstaller --onefile --collect-data cv2 --hidden-import="scipy.sparse.csgraph._shortest_path" graph_cut_seam_carving.py >> %LOGFILE% 2>&1
+.\python_portable\python.exe -m PyInstaller --onefile --collect-data cv2 --hidden-import="scipy.sparse.csgraph._shortest_path" --hidden-import="scipy.sparse.csgraph._flow" --hidden-import="scipy.sparse.csgraph._traversal" graph_cut_seam_carving.py >> %LOGFILE% 2>&1
 
 echo   Building interactive_seam_carving.exe...
 .\python_portable\python.exe -m PyInstaller --onefile --collect-data cv2 --paths=. interactive_seam_carving.py >> %LOGFILE% 2>&1
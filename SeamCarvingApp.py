@@ -97,14 +97,11 @@ def run_standard_carver(exe_name):
     # 5. Get Visualization
     viz_flag = ""
     viz_display = "n"
-    if exe_name == "graph_cut_seam_carving.exe":
-        viz_display = "n (Not Supported)"
-    else:
-        viz_choice = input("Show step-by-step visualization? (y/n, default n): ").lower()
-        print(" (NOTE: This will pause on every seam)")
-        if viz_choice in ['y', 'yes']:
-            viz_flag = "--visualize"
-            viz_display = "y"
+    viz_choice = input("Show step-by-step visualization? (y/n, default n): ").lower()
+    print(" (NOTE: This will pause on every seam)")
+    if viz_choice in ['y', 'yes']:
+        viz_flag = "--visualize"
+        viz_display = "y"
 
     # 6. Execute
     print("\n" + "=" * 40)
@@ -153,12 +150,15 @@ def run_interactive_tool():
             break
     
     print("\n Launching tool...")
-    print(" - Move the sliders to resize the image.")
-    print(" - (This may lag as it re-calculates!)")
+    print(" - The seams are pre-computed in the background (see the %).")
+    print(" - Then move the sliders to resize the image instantly.")
+    print(" - With both sliders lowered, a new width first carves its")
+    print("   own horizontal seams (can take seconds, see the title).")
     print(" - Press 's' in the window to save the result.")
     print(" - Press 'q' or ESC in the window to quit.\n")
     
-    command = f'{exe_name} "images\\{input_file}"'
+    # Seams are kept in 'seam_cache' so the next run starts instantly
+    command = f'{exe_name} "images\\{input_file}" --cache_dir seam_cache'
     run_command(command)
     
     print("\nTool closed. Press Enter to return to the menu.")
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""Seam Finder Benchmark
+
+Times the seam finders on the energy map of one image and compares the
+energy of the seams they return with the optimal (DP) seam, and
+reports how many graph nodes the A* search expands. Every finder is
+also checked for a valid seam on an energy map with seams masked to
+inf, as SeamCarver.find_seams() hands it with --seams_per_pass (a
+SeamNotFoundError is fine: the engine then falls back to DP). Then
+compares ways of finding k seams: k sequential DP seams, k DP seams on
+one masked energy map and k disjoint seams from one min-cost flow.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from graph_cut_seam_carving import (
+    find_disjoint_seams_min_cost_flow,
+    find_vertical_seam_shortest_path,
+)
+from greedy_algorithm_seam_carving import (
+    find_vertical_seam_beam,
+    find_vertical_seam_greedy,
+    find_vertical_seam_greedy_all_starts,
+    find_vertical_seam_lookahead,
+)
+from seam_carving import (
+    SeamCarver,
+    SeamNotFoundError,
+    compute_energy,
+    find_vertical_seam_dp,
+)
+from seam_carving.cli import load_image
+from seam_carving.energy import DEFAULT_ENERGY, ENERGY_FUNCTIONS
+
+# Width of the text bars in the chart
+BAR_WIDTH = 40
+
+# Seams masked to inf in the map for the validity check
+MASKED_SEAMS = 16
+
+
+def seam_cost(energy_map, seam):
+    """Total energy of a seam."""
+    rows = np.arange(energy_map.shape[0])
+    return float(energy_map[rows, np.asarray(seam, dtype=np.intp)].sum())
+
+
+def seam_is_valid(seam, width):
+    """True if 'seam' stays inside the image and moves at most 1 a row."""
+    seam = np.asarray(seam, dtype=np.int64)
+    return bool((seam >= 0).all() and (seam < width).all()
+                and (np.abs(np.diff(seam)) <= 1).all())
+
+
+def time_finder(finder, energy_map, repeat):
+    """Returns (best time in seconds, seam) over 'repeat' runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        seam = finder(energy_map)
+        best = min(best, time.perf_counter() - start)
+    return best, seam
+
+
+def dp_sequential_seams(image, energy, count):
+    """
+    k seams found and removed one at a time with the DP engine, in
+    original coordinates.
+    """
+    carver = SeamCarver(image, energy_function=energy)
+    for _ in range(count):
+        carver.remove_seam(carver.find_seam())
+    return carver.seam_history()
+
+
+def dp_masked_seams(image, energy, count):
+    """k non-overlapping DP seams from one (masked) energy map."""
+    return SeamCarver(image, find_vertical_seam_dp, energy_function=energy
+                      ).find_seams(count)
+
+
+def print_chart(title, rows, value_index, unit):
+    """Prints a horizontal text bar chart of one column of 'rows'."""
+    print(f"\n{title}")
+    peak = max(row[value_index] for row in rows) or 1.0
+    for row in rows:
+        value = row[value_index]
+        bar = '#' * max(int(round(BAR_WIDTH * value / peak)), 1)
+        print(f"  {row[0]:>18} | {bar} {value:.2f}{unit}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seam Finder Benchmark")
+    parser.add_argument(
+        "input_image", type=str, help="Path to the input image"
+    )
+    parser.add_argument(
+        "--direction",
+        type=str,
+        default="vertical",
+        choices=["vertical", "horizontal"],
+        help="Direction of the seams",
+    )
+    parser.add_argument(
+        "--energy",
+        type=str,
+        default=DEFAULT_ENERGY,
+        choices=sorted(ENERGY_FUNCTIONS),
+        help="Energy function used to rank pixels",
+    )
+    parser.add_argument(
+        "--beams",
+        type=str,
+        default="1,2,4,8,16,32,64,128,256",
+        help="Comma separated beam widths to chart",
+    )
+    parser.add_argument(
+        "--lookaheads",
+        type=str,
+        default="2,3,4,6,8",
+        help="Comma separated lookahead depths to chart",
+    )
+    parser.add_argument(
+        "--batch_seams", "--batch-seams",
+        type=int,
+        default=8,
+        help="Number of seams for the k-seam comparison (0 = skip)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per finder; the fastest is reported",
+    )
+    parser.add_argument(
+        "--csv",
+        type=str,
+        default=None,
+        help="Also write the results to a CSV file",
+    )
+    args = parser.parse_args()
+
+    image = load_image(args.input_image)
+    if args.direction == 'horizontal':
+        image = np.ascontiguousarray(image.transpose(1, 0, 2))
+    energy_map = compute_energy(image, energy=args.energy)
+    print(f"Energy map: {energy_map.shape} ({args.energy})")
+
+    finders = [
+        ("dp", find_vertical_seam_dp),
+        ("greedy", find_vertical_seam_greedy),
+        ("greedy all-starts", find_vertical_seam_greedy_all_starts),
+    ]
+    # Nodes expanded by the A* searches (Dijkstra settles every node)
+    expanded = []
+    for solver, name in (('dijkstra', "graph dijkstra"), ('dag', "graph dag"),
+                         ('astar', "graph A*")):
+        finders.append((
+            name,
+            lambda e, solver=solver: find_vertical_seam_shortest_path(
+                e, solver=solver, expanded=expanded
+            ),
+        ))
+    for beam in (int(b) for b in args.beams.split(',') if b.strip()):
+        finders.append((
+            f"beam B={beam}",
+            lambda e, beam=beam: find_vertical_seam_beam(e, beam),
+        ))
+    for depth in (int(k) for k in args.lookaheads.split(',') if k.strip()):
+        finders.append((
+            f"lookahead k={depth}",
+            lambda e, depth=depth: find_vertical_seam_lookahead(e, depth),
+        ))
+
+    # name, time (ms), cost, cost relative to DP (%)
+    rows = []
+    for name, finder in finders:
+        elapsed, seam = time_finder(finder, energy_map, args.repeat)
+        rows.append([name, elapsed * 1000.0, seam_cost(energy_map, seam)])
+
+    optimal = rows[0][2]
+    print(f"\n{'finder':>18} | {'time (ms)':>10} | {'seam cost':>12} | "
+          f"{'vs DP':>8}")
+    for row in rows:
+        row.append(100.0 * row[2] / optimal if optimal else 100.0)
+        print(f"{row[0]:>18} | {row[1]:>10.2f} | {row[2]:>12.1f} | "
+              f"{row[3]:>7.1f}%")
+
+    num_nodes = energy_map.size + 2
+    print(f"\nA* expanded {expanded[-1]} of the {num_nodes} graph nodes "
+          f"({100.0 * expanded[-1] / num_nodes:.1f}%); Dijkstra settles "
+          f"all of them")
+
+    # Masked maps have inf next to inf, where padded neighbors can win.
+    # With a whole row masked every path costs inf, as in the last
+    # passes of find_seams() once most columns are taken.
+    seams_masked = energy_map.astype(np.float64)
+    seams = dp_masked_seams(image, args.energy, MASKED_SEAMS)
+    seams_masked[np.arange(energy_map.shape[0]), seams] = np.inf
+    row_masked = energy_map.astype(np.float64)
+    row_masked[energy_map.shape[0] // 2] = np.inf
+    for label, masked in ((f"{len(seams)} seams", seams_masked),
+                          ("one row", row_masked)):
+        invalid = []
+        for name, finder in finders:
+            try:
+                seam = finder(masked)
+            except SeamNotFoundError:
+                continue  # SeamCarver falls back to the DP search
+            if not seam_is_valid(seam, masked.shape[1]):
+                invalid.append(name)
+        print(f"\nSeams on a map with {label} masked to inf: "
+              + (f"INVALID from {', '.join(invalid)}" if invalid
+                 else "all valid"))
+
+    print_chart("Time per seam", rows, 1, " ms")
+    print_chart("Seam cost relative to DP", rows, 3, "%")
+
+    # k seams: total energy of the removed pixels on the original map
+    batch_rows = []
+    if args.batch_seams > 0:
+        k = args.batch_seams
+        batch_finders = [
+            (f"dp sequential x{k}",
+             lambda e: dp_sequential_seams(image, args.energy, k)),
+            (f"dp masked x{k}",
+             lambda e: dp_masked_seams(image, args.energy, k)),
+            (f"min-cost flow x{k}",
+             lambda e: find_disjoint_seams_min_cost_flow(e, count=k)),
+        ]
+        for name, finder in batch_finders:
+            elapsed, seams = time_finder(finder, energy_map, args.repeat)
+            total = sum(seam_cost(energy_map, seam) for seam in seams)
+            batch_rows.append([name, elapsed * 1000.0, total])
+
+        sequential = batch_rows[0][2]
+        print(f"\n{'k seams':>18} | {'time (ms)':>10} | {'total cost':>12} | "
+              f"{'vs seq':>8}")
+        for row in batch_rows:
+            row.append(100.0 * row[2] / sequential if sequential else 100.0)
+            print(f"{row[0]:>18} | {row[1]:>10.2f} | {row[2]:>12.1f} | "
+                  f"{row[3]:>7.1f}%")
+
+        print_chart(f"Time for {k} seams", batch_rows, 1, " ms")
+        print_chart(f"Total cost of {k} seams relative to sequential DP",
+                    batch_rows, 3, "%")
+
+    if args.csv:
+        with open(args.csv, 'w') as f:
+            f.write("finder,time_ms,seam_cost,cost_vs_dp_percent\n")
+            for row in rows + batch_rows:
+                f.write(f"{row[0]},{row[1]:.4f},{row[2]:.4f},{row[3]:.4f}\n")
+        print(f"\nResults saved to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
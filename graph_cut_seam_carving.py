@@ -1,232 +1,1152 @@
 # -*- coding: utf-8 -*-
 """
-Seam Carving using a Graph (Shortest Path Algorithm)
-This is an alternative to the Max-Flow / Min-Cut approach, which
-is unstable when compiled. This version uses Dijkstra's algorithm
-on a sparse graph, which is equivalent and more stable.
+Seam Carving using a Graph (Shortest Path or Max-Flow / Min-Cut)
+By default a seam is the shortest source-sink path through a sparse
+pixel graph, found with Dijkstra's algorithm or by relaxing the graph
+row by row (it is a layered DAG). '--solver maxflow' instead finds it
+as a true minimum cut (Rubinstein et al.) with SciPy's Dinic max-flow,
+the formulation that also extends to video and volume surfaces.
+'--batch_seams k' finds k pixel-disjoint seams of minimum total energy
+with one min-cost flow and removes them together.
 """
 
+import heapq
+import sys
+from functools import partial
+
 import cv2
 import numpy as np
-import argparse
-import sys
-import time
-import os
 from scipy.sparse import csr_matrix
-from scipy.sparse.csgraph import shortest_path
+from scipy.sparse.csgraph import (
+    breadth_first_order,
+    maximum_flow,
+    shortest_path,
+)
 
-# --- Energy function (same as before) ---
-def compute_energy(image):
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-    sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-    return np.abs(sobel_x) + np.abs(sobel_y)
+from seam_carving import (
+    SeamNotFoundError,
+    find_vertical_seam_dp,
+    seam_keep_mask,
+)
+from seam_carving.cli import build_parser, run
+from seam_carving.seams import remove_with_mask
 
 
-# --- Seam removal (same as before) ---
-def remove_vertical_seam(image, seam):
-    height, width, channels = image.shape
-    new_image = np.zeros((height, width - 1, channels), dtype=image.dtype)
-    for i in range(height):
-        col_to_remove = seam[i]
-        new_image[i, :col_to_remove] = image[i, :col_to_remove]
-        new_image[i, col_to_remove:] = image[i, col_to_remove + 1:]
-    return new_image
+# Predecessor of nodes without one (as in scipy.sparse.csgraph)
+NO_PREDECESSOR = -9999
 
 
-def find_vertical_seam_shortest_path(energy_map):
+class SeamGraph:
     """
-    Finds the lowest-energy vertical seam by building a graph and
-    finding the shortest path from a virtual 'source' to 'sink'.
+    A seam graph in CSR form plus what the solvers need to know about
+    its layout.
+
+    Args:
+        graph: (num_nodes, num_nodes) csr_matrix of edge weights
+        source: Index of the virtual source node
+        sink: Index of the virtual sink node
+        layers: (start, stop) node ranges in topological order. Every
+            edge leaves a node of one layer for a node of a later one.
+        node_columns: Image column of every node (-1 for source/sink)
+    """
+
+    def __init__(self, graph, source, sink, layers, node_columns):
+        self.graph = graph
+        self.source = source
+        self.sink = sink
+        self.layers = layers
+        self.node_columns = node_columns
+
+    @property
+    def num_nodes(self):
+        return self.graph.shape[0]
+
+
+def forward_energy_costs(gray):
+    """
+    Forward energy of Rubinstein et al. (2008): the intensity
+    differences a seam creates between pixels that become neighbors.
+
+    Returns float32 (height, width) maps (C_U, C_L, C_R): the cost of
+    removing pixel (i, j) when the seam enters it from straight above,
+    from the upper left or from the upper right. Columns outside the
+    image repeat the border column.
+    """
+    intensity = np.asarray(gray, dtype=np.float32)
+    padded = np.pad(intensity, ((0, 0), (1, 1)), mode='edge')
+    left, right = padded[:, :-2], padded[:, 2:]
+    above = np.empty_like(intensity)
+    above[0] = intensity[0]
+    above[1:] = intensity[:-1]
+
+    c_up = np.abs(right - left)
+    c_left = c_up + np.abs(above - left)
+    c_right = c_up + np.abs(above - right)
+    return c_up, c_left, c_right
+
+
+def _move_targets(width):
+    """
+    Child columns of the moves (-1, 0, +1) out of every column and which
+    of them stay inside the image, as (width, 3) arrays.
+    """
+    cols = np.arange(width, dtype=np.int32)
+    targets = cols[:, None] + np.array([-1, 0, 1], dtype=np.int32)
+    valid = (targets >= 0) & (targets < width)
+    return targets, valid
+
+
+def _entry_costs(energy_map, gray=None):
+    """
+    Cost of entering every pixel, per move: a (1, height, width) array
+    of the pixel energy (backward energy), or with 'gray' a
+    (3, height, width) array adding C_R, C_U, C_L for the moves -1, 0
+    and +1 (forward energy).
+    """
+    energy = np.asarray(energy_map, dtype=np.float32)
+    if gray is None:
+        return energy[None]
+    c_up, c_left, c_right = forward_energy_costs(gray)
+    return np.stack([energy + c_right, energy + c_up, energy + c_left])
+
+
+def _edge_weights(entry_costs, valid_targets, move_index):
+    """
+    Weights of the pixel -> next row edges (in CSR order) and of the
+    source edges, from _entry_costs().
+    """
+    if len(entry_costs) == 1:
+        pixel_data = entry_costs[0][1:, valid_targets]
+    else:
+        rows = np.arange(1, entry_costs.shape[1])[:, None]
+        pixel_data = entry_costs[move_index, rows, valid_targets]
+    # The top row is entered from the source, i.e. straight down
+    source_data = entry_costs[len(entry_costs) // 2, 0]
+    return pixel_data.ravel(), source_data
+
+
+def build_seam_graph(energy_map, gray=None):
+    """
+    Builds the seam graph of an energy map directly in CSR form.
+
+    Node i * width + j is pixel (i, j); a virtual source (height * width)
+    connects to every top-row pixel and every bottom-row pixel connects
+    to a virtual sink (height * width + 1). Every other pixel has an
+    edge to each of its (up to) 3 neighbors in the next row. An edge
+    carries the energy of the pixel it enters, so the length of a
+    source-sink path is the energy of its seam. With 'gray' (the
+    grayscale image) an edge also carries the forward energy of its
+    direction (forward_energy_costs()).
+
+    All edge arrays are generated with broadcasting: int32 indices,
+    float32 weights (exact for the integer-valued gradient energies).
+    Returns a SeamGraph whose layers are the source and the image rows.
     """
     height, width = energy_map.shape
-    
-    # Total nodes = (height * width) + 2 virtual nodes
-    num_nodes = height * width + 2
-    source_node = height * width
-    sink_node = height * width + 1
-    
-    # Helper to map (row, col) to a node index
-    def pixel_to_node(i, j):
-        return i * width + j
-
-    # We build the sparse graph in COO format (row, col, data)
-    graph_rows = []
-    graph_cols = []
-    graph_data = []
-
-    # 1. Connect Source to all top-row pixels
-    for j in range(width):
-        graph_rows.append(source_node)
-        graph_cols.append(pixel_to_node(0, j))
-        graph_data.append(energy_map[0, j])
-
-    # 2. Connect all other pixels to their 3 children
-    for i in range(height - 1):
-        for j in range(width):
-            current_node = pixel_to_node(i, j)
-            # Check neighbors: (i+1, j-1), (i+1, j), (i+1, j+1)
-            for dj in [-1, 0, 1]:
-                nj = j + dj
-                if 0 <= nj < width:
-                    neighbor_node = pixel_to_node(i + 1, nj)
-                    graph_rows.append(current_node)
-                    graph_cols.append(neighbor_node)
-                    graph_data.append(energy_map[i + 1, nj])
-
-    # 3. Connect all bottom-row pixels to the Sink
-    for j in range(width):
-        graph_rows.append(pixel_to_node(height - 1, j))
-        graph_cols.append(sink_node)
-        graph_data.append(0) # No cost to go to sink
-    
-    # Create the sparse graph
-    graph = csr_matrix((graph_data, (graph_rows, graph_cols)), 
-                       shape=(num_nodes, num_nodes))
-    
-    # --- Compute Shortest Path ---
-    # Find shortest path from 'source_node' to all other nodes
-    distances, predecessors = shortest_path(
-        csgraph=graph,
+    num_pixels = height * width
+    source_node = num_pixels
+    sink_node = num_pixels + 1
+
+    targets, valid = _move_targets(width)
+    valid_targets = targets[valid]  # row-major, i.e. sorted per node
+    move_index = np.nonzero(valid)[1]
+
+    # Pixel -> next row edges for rows 0..height-2
+    next_rows = np.arange(1, height, dtype=np.int32)[:, None] * width
+    pixel_indices = (next_rows + valid_targets).ravel()
+    pixel_data, source_data = _edge_weights(
+        _entry_costs(energy_map, gray), valid_targets, move_index
+    )
+
+    # Out-degree of every node, in node order
+    degree = np.empty(num_pixels + 2, dtype=np.int32)
+    degree[:num_pixels - width] = np.tile(valid.sum(axis=1), height - 1)
+    degree[num_pixels - width:num_pixels] = 1  # bottom row -> sink
+    degree[source_node] = width
+    degree[sink_node] = 0
+
+    indptr = np.zeros(num_pixels + 3, dtype=np.int32)
+    np.cumsum(degree, out=indptr[1:])
+
+    indices = np.concatenate([
+        pixel_indices,
+        np.full(width, sink_node, dtype=np.int32),
+        np.arange(width, dtype=np.int32),
+    ])
+    data = np.concatenate([
+        pixel_data,
+        np.zeros(width, dtype=np.float32),  # No cost to go to sink
+        source_data,
+    ])
+
+    graph = csr_matrix((data, indices, indptr),
+                       shape=(num_pixels + 2, num_pixels + 2))
+
+    layers = [(source_node, source_node + 1)]
+    layers += [(i * width, (i + 1) * width) for i in range(height)]
+    node_columns = np.concatenate([
+        np.tile(np.arange(width, dtype=np.int32), height),
+        np.array([-1, -1], dtype=np.int32),
+    ])
+    return SeamGraph(graph, source_node, sink_node, layers, node_columns)
+
+
+# Width reduction of the pyramid level that banded graphs take their
+# hint seam from
+BAND_PYRAMID_FACTOR = 4
+
+
+def coarse_seam_hint(energy_map, factor=BAND_PYRAMID_FACTOR):
+    """
+    Estimates the seam from a coarser pyramid level: the DP seam of the
+    energy map shrunk 'factor' times in both directions, mapped back to
+    full resolution by interpolating between coarse rows. The hint moves
+    at most one column per row, like a seam, so any corridor around it
+    contains a seam.
+    """
+    height, width = energy_map.shape
+    small_width = max(width // factor, 1)
+    small_height = max(height // factor, 1)
+    small = cv2.resize(np.asarray(energy_map, dtype=np.float32),
+                       (small_width, small_height),
+                       interpolation=cv2.INTER_AREA)
+    coarse = find_vertical_seam_dp(small).astype(np.float64)
+
+    # Coarse pixel centers in full-resolution coordinates
+    row_scale, col_scale = height / small_height, width / small_width
+    centers = (np.arange(small_height) + 0.5) * row_scale - 0.5
+    cols = (coarse + 0.5) * col_scale - 0.5
+    hint = np.rint(np.interp(np.arange(height), centers, cols))
+    hint = np.clip(hint, 0, width - 1).astype(np.intp)
+
+    # Unequal row/column scales can still make it step further
+    for i in range(1, height):
+        hint[i] = min(max(hint[i], hint[i - 1] - 1), hint[i - 1] + 1)
+    return hint
+
+
+def build_banded_seam_graph(energy_map, hint, band, gray=None):
+    """
+    Builds the seam graph (see build_seam_graph()) restricted to a
+    corridor of +/- 'band' columns around a hint seam, e.g. from a
+    coarser pyramid level or the previous frame.
+
+    Row i has 2 * band + 1 nodes for columns hint[i] - band ..
+    hint[i] + band; nodes outside the image get no edges. The graph
+    has height * (2 * band + 1) + 2 nodes whatever the image width,
+    and its shortest path is the best seam inside the corridor.
+    """
+    height, width = energy_map.shape
+    span = 2 * band + 1
+    num_band_nodes = height * span
+    source_node = num_band_nodes
+    sink_node = num_band_nodes + 1
+
+    hint = np.clip(np.asarray(hint, dtype=np.int32), 0, width - 1)
+    corridor = hint[:, None] - band + np.arange(span, dtype=np.int32)
+    inside = (corridor >= 0) & (corridor < width)
+
+    # Moves out of every node of rows 0..height-2 and the node (slot
+    # in the next row's corridor) each one enters
+    moves = np.array([-1, 0, 1], dtype=np.int32)
+    child_cols = corridor[:-1, :, None] + moves
+    child_slots = child_cols - corridor[1:, :1, None]
+    valid = (inside[:-1, :, None] & (child_cols >= 0) & (child_cols < width)
+             & (child_slots >= 0) & (child_slots < span))
+
+    entry_costs = _entry_costs(energy_map, gray)
+    rows = np.broadcast_to(
+        np.arange(1, height, dtype=np.int32)[:, None, None], valid.shape
+    )
+    move_index = np.broadcast_to(np.arange(3), valid.shape)
+    if len(entry_costs) == 1:
+        move_index = np.zeros_like(move_index)
+    pixel_data = entry_costs[move_index[valid], rows[valid],
+                             child_cols[valid]]
+    pixel_indices = (rows * span + child_slots)[valid]
+
+    # Out-degree of every node, in node order
+    degree = np.zeros(num_band_nodes + 2, dtype=np.int32)
+    degree[:num_band_nodes - span] = valid.sum(axis=2).ravel()
+    degree[num_band_nodes - span:num_band_nodes] = inside[-1]  # -> sink
+    degree[source_node] = np.count_nonzero(inside[0])
+
+    indptr = np.zeros(num_band_nodes + 3, dtype=np.int32)
+    np.cumsum(degree, out=indptr[1:])
+
+    top = np.nonzero(inside[0])[0].astype(np.int32)
+    indices = np.concatenate([
+        pixel_indices,
+        np.full(np.count_nonzero(inside[-1]), sink_node, dtype=np.int32),
+        top,
+    ])
+    data = np.concatenate([
+        pixel_data,
+        np.zeros(np.count_nonzero(inside[-1]), dtype=np.float32),
+        entry_costs[len(entry_costs) // 2, 0, corridor[0, top]],
+    ])
+
+    graph = csr_matrix((data, indices, indptr),
+                       shape=(num_band_nodes + 2, num_band_nodes + 2))
+
+    layers = [(source_node, source_node + 1)]
+    layers += [(i * span, (i + 1) * span) for i in range(height)]
+    node_columns = np.concatenate([
+        np.where(inside, corridor, -1).ravel(),
+        np.array([-1, -1], dtype=np.int32),
+    ])
+    return SeamGraph(graph, source_node, sink_node, layers, node_columns)
+
+
+# Rebuild a reusable graph once the image is this much narrower than
+# the graph, so solves do not keep paying for masked columns
+GRAPH_COMPACTION_RATIO = 0.75
+
+
+class ReusableSeamGraph:
+    """
+    A seam graph kept across seam iterations.
+
+    The CSR index arrays are built once for the widest energy map seen.
+    Narrower maps (the image after seams were removed) reuse them: a
+    W-column seam graph is exactly the subgraph of the wider one on its
+    first W columns, so only the edge weights are rewritten, in place,
+    and edges into the columns beyond W get infinite weight (masked).
+    When the image has shrunk below GRAPH_COMPACTION_RATIO of the
+    graph's width, the graph is compacted by rebuilding it.
+    """
+
+    def __init__(self):
+        self.seam_graph = None
+        self.shape = (0, 0)
+        self.rebuilds = 0
+
+        # Energy per node (pixels, then source and sink); every
+        # backward energy edge weight is the energy of the node it enters
+        self._node_energy = None
+
+        # Edge layout of the graph's rows (for forward energy weights)
+        self._valid_targets = None
+        self._move_index = None
+
+    def update(self, energy_map, gray=None):
+        """
+        Returns the SeamGraph weighted with 'energy_map' (and forward
+        energy when 'gray' is given, see build_seam_graph()).
+        """
+        height, width = energy_map.shape
+        slots = self.shape[1]
+        if (self.seam_graph is None or height != self.shape[0]
+                or width > slots or width < slots * GRAPH_COMPACTION_RATIO):
+            self._build(height, width)
+            slots = width
+
+        graph = self.seam_graph.graph
+        if gray is None:
+            pixels = self._node_energy[:height * slots].reshape(height, slots)
+            pixels[:, :width] = energy_map
+            pixels[:, width:] = np.inf  # Masked columns
+            np.take(self._node_energy, graph.indices, out=graph.data)
+            return self.seam_graph
+
+        entry_costs = np.pad(
+            _entry_costs(energy_map, gray),
+            ((0, 0), (0, 0), (0, slots - width)),
+            constant_values=np.inf  # Masked columns
+        )
+        pixel_data, source_data = _edge_weights(
+            entry_costs, self._valid_targets, self._move_index
+        )
+        graph.data[:len(pixel_data)] = pixel_data
+        graph.data[len(pixel_data):-slots] = 0.0  # Bottom row -> sink
+        graph.data[-slots:] = source_data
+        return self.seam_graph
+
+    def _build(self, height, width):
+        self.seam_graph = build_seam_graph(
+            np.zeros((height, width), dtype=np.float32)
+        )
+        self.shape = (height, width)
+        self._node_energy = np.zeros(height * width + 2, dtype=np.float32)
+
+        targets, valid = _move_targets(width)
+        self._valid_targets = targets[valid]
+        self._move_index = np.nonzero(valid)[1]
+        self.rebuilds += 1
+
+
+class UnreachableSinkError(SeamNotFoundError):
+    """No pixel of the last row is reachable from the source."""
+
+
+class BrokenPathError(SeamNotFoundError):
+    """The predecessor chain does not form a seam back to the source."""
+
+
+def recover_seam(seam_graph, distances, predecessors, height):
+    """
+    Returns the seam (image columns) of the shortest path to the last
+    row, given a solver's distances and predecessors.
+
+    The path ends at the closest node of the last layer (vectorized
+    argmin, ties go to the lowest index) and is followed back through
+    the int32 predecessor array, one node per row. Raises
+    UnreachableSinkError or BrokenPathError (both SeamNotFoundError,
+    which the SeamCarver answers with a DP search) instead of guessing.
+    """
+    bottom_start, bottom_stop = seam_graph.layers[-1]
+    bottom = distances[bottom_start:bottom_stop]
+    if len(bottom) == 0:
+        raise UnreachableSinkError("the seam graph has no last row")
+    end = int(np.argmin(bottom))
+    if not np.isfinite(bottom[end]):
+        raise UnreachableSinkError(
+            "no pixel of the last row is reachable from the source"
+        )
+
+    predecessors = np.asarray(predecessors, dtype=np.int32)
+    path = np.empty(height, dtype=np.int32)
+    node = bottom_start + end
+    for i in range(height - 1, -1, -1):
+        path[i] = node
+        node = predecessors[node]
+        if node < 0:
+            raise BrokenPathError(f"predecessor chain ends at row {i}")
+
+    if node != seam_graph.source:
+        raise BrokenPathError("predecessor chain does not reach the source")
+
+    seam = seam_graph.node_columns[path]
+    if seam.min() < 0 or (height > 1 and np.abs(np.diff(seam)).max() > 1):
+        raise BrokenPathError("predecessor chain is not a connected seam")
+    return seam.astype(np.uint32)
+
+
+def shortest_path_dijkstra(seam_graph):
+    """
+    Distances and predecessors from the source with SciPy's generic
+    Dijkstra over the whole graph.
+    """
+    return shortest_path(
+        csgraph=seam_graph.graph,
         directed=True,
-        indices=source_node,
+        indices=seam_graph.source,
         return_predecessors=True
     )
 
-    # The shortest path to the sink is our seam energy, but we
-    # need to find the *end* of the seam by finding the
-    # bottom-row pixel that connects to the sink with the min cost.
-    
-    # Find the node in the last row with the min total distance
-    min_dist = np.inf
-    end_node = -1
-    for j in range(width):
-        node = pixel_to_node(height - 1, j)
-        if distances[node] < min_dist:
-            min_dist = distances[node]
-            end_node = node
-            
-    if end_node == -1:
-        # This should not happen, but as a fallback, take the min energy
-        end_node = pixel_to_node(height - 1, np.argmin(energy_map[height - 1]))
-
-    # --- Backtrack from the end node to find the seam ---
-    seam = np.zeros(height, dtype=np.uint32)
-    current_node = end_node
-    
-    for i in range(height - 1, -1, -1):
-        if current_node == -9999 or current_node == source_node:
-            # We've reached the start, but something is wrong
-            # As a fallback, just use the current column
-            print("Warning: Shortest path backtrack failed. Using fallback.")
-            seam[i] = seam[i+1] if i < height - 1 else 0
-        else:
-            seam[i] = current_node % width # Get col from node index
-            current_node = predecessors[current_node]
 
-    return seam
+def shortest_path_dag(seam_graph):
+    """
+    Distances and predecessors from the source by relaxing the graph
+    one layer at a time in topological order.
+
+    The seam graph is a layered DAG, so every node is final once the
+    layers before it are relaxed: no priority queue is needed and each
+    edge is relaxed exactly once, a whole layer per vectorized step.
+    Works on any SeamGraph, so other edge weights or extra edges
+    between layers plug in unchanged. Among equally short paths the
+    predecessor with the lowest node index (leftmost pixel) wins, as in
+    the DP backtrack.
+    """
+    graph = seam_graph.graph
+    indptr, indices, data = graph.indptr, graph.indices, graph.data
 
+    distances = np.full(seam_graph.num_nodes, np.inf)
+    distances[seam_graph.source] = 0.0
+    predecessors = np.full(seam_graph.num_nodes, NO_PREDECESSOR,
+                           dtype=np.int32)
+    unset = np.iinfo(np.int32).max
+    leftmost = np.full(seam_graph.num_nodes, unset, dtype=np.int32)
 
-# --- Carve function (uses the new find_seam) ---
-def carve(image, num_seams, direction):
-    carved_image = np.copy(image)
+    for start, stop in seam_graph.layers:
+        e0, e1 = indptr[start], indptr[stop]
+        if e0 == e1:
+            continue
 
-    for k in range(num_seams):
-        if direction == "horizontal":
-            carved_image = carved_image.transpose(1, 0, 2)
+        sources = np.repeat(np.arange(start, stop, dtype=np.int32),
+                            np.diff(indptr[start:stop + 1]))
+        targets = indices[e0:e1]
+        candidates = distances[sources] + data[e0:e1]
 
-        energy_map = compute_energy(carved_image)
-        
-        # --- Use the new Shortest Path function ---
-        seam = find_vertical_seam_shortest_path(energy_map)
-        
-        carved_image = remove_vertical_seam(carved_image, seam)
+        np.minimum.at(distances, targets, candidates)
 
-        if direction == "horizontal":
-            carved_image = carved_image.transpose(1, 0, 2)
+        # Lowest-index predecessor among the edges achieving the minimum
+        best = candidates == distances[targets]
+        best_targets = targets[best]
+        np.minimum.at(leftmost, best_targets, sources[best])
+        predecessors[best_targets] = leftmost[best_targets]
+        leftmost[best_targets] = unset
 
-        print(f"Removed seam {k + 1}/{num_seams} (Graph-Shortest-Path)", end='\r')
-    
-    print("\nDone.") # Newline after loop
-    return carved_image
+    return distances, predecessors
 
 
-def find_image_path(input_path):
+def layer_lower_bounds(seam_graph):
     """
-    Finds a valid image path.
-    If 'input_path' is not found, it tries appending
-    .jpg, .jpeg, and .png.
+    Admissible A* heuristic of a seam graph: for every node, a lower
+    bound on the length of its remaining path to the sink.
+
+    Every edge enters the next layer (the sink after the last row), so
+    the rest of a path takes one edge out of its node's layer and one
+    out of every later layer. Summing the cheapest edge out of each
+    layer from the bottom up gives the bound; for a plain energy map it
+    is the cumulative sum of the per-row minimum energies. Since every
+    edge costs at least the difference of the bounds of its ends, the
+    heuristic is also consistent.
+    """
+    graph = seam_graph.graph
+    cheapest = np.zeros(len(seam_graph.layers))
+    for k, (start, stop) in enumerate(seam_graph.layers):
+        e0, e1 = graph.indptr[start], graph.indptr[stop]
+        if e1 > e0:
+            cheapest[k] = graph.data[e0:e1].min()
+    remaining = np.cumsum(cheapest[::-1])[::-1]
+
+    bounds = np.zeros(seam_graph.num_nodes)
+    for k, (start, stop) in enumerate(seam_graph.layers):
+        bounds[start:stop] = remaining[k]
+    return bounds
+
+
+def shortest_path_astar(seam_graph, expanded=None):
     """
-    if os.path.exists(input_path):
-        return input_path
+    Distances and predecessors from the source by A* search towards the
+    sink, guided by layer_lower_bounds().
 
-    # Check for other extensions
-    for ext in ['.jpg', 'jpeg', '.png']:
-        path_with_ext = input_path + ext
-        if os.path.exists(path_with_ext):
-            print(f"Input '{input_path}' not found, using '{path_with_ext}'")
-            return path_with_ext
+    Nodes are expanded in order of distance plus bound and the search
+    stops when the sink is reached, so on images with a clear
+    low-energy channel only a narrow region around the seam is ever
+    expanded. Distances are final for expanded nodes and upper bounds
+    elsewhere (infinite if never reached), which is all recover_seam()
+    needs. The number of expanded nodes is appended to the list
+    'expanded', if given.
+    """
+    graph = seam_graph.graph
+    indptr = graph.indptr.tolist()
+    indices, data = graph.indices, graph.data
+    bounds = layer_lower_bounds(seam_graph).tolist()
+    source, sink = seam_graph.source, seam_graph.sink
 
-    # Check if user already included extension but file is missing
-    base, ext = os.path.splitext(input_path)
-    if ext in ['.jpg', '.jpeg', '.png']:
-         if os.path.exists(base):
-            print(f"Input '{input_path}' not found, using '{base}'")
-            return base
+    distances = np.full(seam_graph.num_nodes, np.inf)
+    distances[source] = 0.0
+    predecessors = np.full(seam_graph.num_nodes, NO_PREDECESSOR,
+                           dtype=np.int32)
+    settled = bytearray(seam_graph.num_nodes)
 
-    return None
+    # (distance + bound, node): equal keys pop the lowest node first
+    heap = [(bounds[source], source)]
+    count = 0
+    while heap:
+        _, node = heapq.heappop(heap)
+        if settled[node]:
+            continue
+        settled[node] = 1
+        count += 1
+        if node == sink:
+            break
+
+        e0, e1 = indptr[node], indptr[node + 1]
+        candidates = distances[node] + data[e0:e1]
+        for child, length in zip(indices[e0:e1].tolist(),
+                                 candidates.tolist()):
+            if length < distances[child]:
+                distances[child] = length
+                predecessors[child] = node
+                heapq.heappush(heap, (length + bounds[child], child))
+
+    if expanded is not None:
+        expanded.append(count)
+    return distances, predecessors
+
+
+SOLVERS = {
+    'dijkstra': shortest_path_dijkstra,
+    'dag': shortest_path_dag,
+    'astar': shortest_path_astar,
+}
+
+
+class IncrementalShortestPaths:
+    """
+    Shortest paths of the seam graph kept across seam iterations.
+
+    The first call solves the whole (reusable) graph with a solver from
+    SOLVERS. Later calls keep the distances and predecessors: the edge
+    weights are compared with the previous ones and, when the map is one
+    column narrower, everything is first compacted by the last seam
+    found (the one removed) and the nodes next to it, whose parents
+    changed, are invalidated. Only invalidated nodes and the cone below
+    them are re-relaxed, row by row, and a row stops propagating as soon
+    as its distances come out unchanged (as update_cumulative_map() does
+    for the DP). Among equally short paths the leftmost parent wins, as
+    in shortest_path_dag().
+
+    Args:
+        solver: Name from SOLVERS used for full solves
+    """
+
+    def __init__(self, solver='dag'):
+        self.solver = solver
+        self.graph = ReusableSeamGraph()
+
+        # Seam found on the last solve; set by the caller and assumed
+        # removed if the next map is one column narrower
+        self.seam = None
+
+        # Statistics: full solves, incremental updates, relaxed nodes
+        self.full_solves = 0
+        self.updates = 0
+        self.relaxed_nodes = 0
+
+        # Per pixel (height, width): entry costs (see _entry_costs()),
+        # distances and the parent column offset (-1, 0, +1)
+        self._costs = None
+        self._distances = None
+        self._moves = None
+        self._seam_graph = None
+
+    def solve(self, energy_map, gray=None):
+        """
+        Returns (seam_graph, distances, predecessors) for 'energy_map'
+        (with forward energy when 'gray' is given), updating the
+        previous solution when possible.
+        """
+        costs = _entry_costs(energy_map, gray)
+        seam, self.seam = self.seam, None
+        dirty = self._invalidate(costs, seam)
+        if dirty is None:
+            return self._full_solve(energy_map, gray, costs)
+
+        self._relax(*dirty)
+        self.updates += 1
+        return (self._seam_graph,) + self._node_arrays()
+
+    def _invalidate(self, costs, seam):
+        """
+        Adopts 'costs' and returns the per-row (lo, hi) column ranges
+        that must be re-relaxed, or None if a full solve is needed.
+        """
+        if self._costs is None or costs.shape[:2] != self._costs.shape[:2]:
+            return None
+        height, width = costs.shape[1:]
+        old_width = self._costs.shape[2]
+        if width < self.graph.shape[1] * GRAPH_COMPACTION_RATIO:
+            return None  # Let the reusable graph compact itself
+
+        lo = np.full(height, width, dtype=np.intp)
+        hi = np.full(height, -1, dtype=np.intp)
+        if width == old_width - 1 and seam is not None:
+            seam = np.asarray(seam, dtype=np.intp)
+            keep = seam_keep_mask((height, old_width), seam)
+            self._costs = np.stack([remove_with_mask(plane, keep)
+                                    for plane in self._costs])
+            self._distances = remove_with_mask(self._distances, keep)
+            self._moves = remove_with_mask(self._moves, keep)
+
+            # Nodes whose parent columns changed (new coordinates)
+            lo[1:] = np.minimum(seam[1:], seam[:-1]) - 2
+            hi[1:] = np.maximum(seam[1:], seam[:-1]) + 1
+        elif width != old_width:
+            return None
+
+        # Nodes whose entry costs changed
+        changed = (costs != self._costs).any(axis=0)
+        rows = changed.any(axis=1)
+        first = np.argmax(changed, axis=1)
+        last = width - 1 - np.argmax(changed[:, ::-1], axis=1)
+        lo[rows] = np.minimum(lo[rows], first[rows])
+        hi[rows] = np.maximum(hi[rows], last[rows])
+
+        self._costs = costs
+        return np.maximum(lo, 0), np.minimum(hi, width - 1)
+
+    def _relax(self, dirty_lo, dirty_hi):
+        """Re-relaxes the dirty ranges and the cone below them."""
+        costs, distances, moves = self._costs, self._distances, self._moves
+        height, width = distances.shape
+        last = width - 1
+        dirty_lo, dirty_hi = dirty_lo.tolist(), dirty_hi.tolist()
+        changed_lo, changed_hi = None, None
+
+        for i in range(height):
+            lo, hi = dirty_lo[i], dirty_hi[i]
+            if changed_lo is not None:
+                lo = min(lo, max(changed_lo - 1, 0))
+                hi = max(hi, min(changed_hi + 1, last))
+            if lo > hi:
+                changed_lo = None
+                continue
+            self.relaxed_nodes += hi - lo + 1
+
+            if i == 0:
+                # Entered from the source, i.e. straight down
+                new = costs[len(costs) // 2, 0, lo:hi + 1].astype(np.float64)
+                new_moves = np.zeros(hi - lo + 1, dtype=np.int8)
+            else:
+                # Candidates through the parents j - 1, j, j + 1; the
+                # move into j from parent j + d is -d
+                candidates = np.full((3, hi - lo + 1), np.inf)
+                for d in (-1, 0, 1):
+                    a, b = max(lo + d, 0), min(hi + d, last)
+                    if a > b:
+                        continue
+                    plane = 1 - d if len(costs) == 3 else 0
+                    candidates[d + 1, a - d - lo:b - d - lo + 1] = (
+                        distances[i - 1, a:b + 1]
+                        + costs[plane, i, a - d:b - d + 1]
+                    )
+                best = np.argmin(candidates, axis=0)
+                if lo == 0:
+                    best[0] = max(best[0], 1)  # Column 0 has no j - 1
+                new = candidates[best, np.arange(hi - lo + 1)]
+                new_moves = (best - 1).astype(np.int8)
+
+            moves[i, lo:hi + 1] = new_moves
+            changed = (new != distances[i, lo:hi + 1]).nonzero()[0]
+            if changed.size:
+                distances[i, lo:hi + 1] = new
+                changed_lo, changed_hi = lo + changed[0], lo + changed[-1]
+            else:
+                changed_lo = None
+
+    def _full_solve(self, energy_map, gray, costs):
+        """Solves the whole graph and keeps its distances per pixel."""
+        seam_graph = self.graph.update(energy_map, gray)
+        distances, predecessors = SOLVERS[self.solver](seam_graph)
+
+        height, width = energy_map.shape
+        slots = self.graph.shape[1]
+        pixels = slice(0, height * slots)
+        self._distances = distances[pixels].reshape(height, slots)[:, :width]
+        self._distances = self._distances.copy()
+        parents = predecessors[pixels].reshape(height, slots)[:, :width]
+        moves = parents % slots - np.arange(width)
+        moves[0] = 0
+        moves[parents < 0] = 0
+        self._moves = moves.astype(np.int8)
+        self._costs = costs
+        self._seam_graph = seam_graph
+
+        self.full_solves += 1
+        self.relaxed_nodes += height * width
+        return seam_graph, distances, predecessors
+
+    def _node_arrays(self):
+        """Distances and predecessors in the seam graph's node order."""
+        seam_graph = self._seam_graph
+        height, width = self._distances.shape
+        slots = self.graph.shape[1]
+        nodes = np.arange(height * slots, dtype=np.int32).reshape(
+            height, slots
+        )[:, :width]
+
+        distances = np.full(seam_graph.num_nodes, np.inf)
+        distances[nodes] = self._distances
+        distances[seam_graph.source] = 0.0
+        predecessors = np.full(seam_graph.num_nodes, NO_PREDECESSOR,
+                               dtype=np.int32)
+        predecessors[nodes[1:]] = nodes[1:] - slots + self._moves[1:]
+        predecessors[nodes[0]] = seam_graph.source
+
+        end = int(np.argmin(self._distances[-1]))
+        distances[seam_graph.sink] = self._distances[-1, end]
+        predecessors[seam_graph.sink] = nodes[-1, end]
+        return distances, predecessors
+
+
+# Capacity of the uncuttable arcs of the min-cut graph. Finite energies
+# are scaled so that any seam costs less than this (int32 capacities).
+MAXFLOW_INFINITY = 2**30
+
+
+def build_cut_graph(energy_map, gray=None):
+    """
+    Builds the min-cut graph of Rubinstein et al. (2008) for a vertical
+    seam directly in CSR form.
+
+    The source feeds the first column and the last column drains into
+    the sink, so a cut splits every row into a left part (source side)
+    and a right part. Arc (i, j) -> (i, j + 1) carries the energy of
+    pixel (i, j), which is removed when that arc is cut; for the last
+    column the arc goes to the sink. Infinite backward arcs
+    (i, j) -> (i, j - 1) allow only one cut per row, and infinite
+    diagonal arcs (i, j) -> (i -/+ 1, j - 1) keep the cuts of adjacent
+    rows within one column of each other, i.e. the cut is a connected
+    seam. Its cost is the seam energy.
+
+    With 'gray' the cut also pays the forward energy: C_U is added to
+    the horizontal arcs, and vertical arcs between rows are only cut
+    when the seam steps left or right, carrying the rest of C_L / C_R.
+
+    Capacities must be integers: energies are rounded after scaling so
+    that any seam stays below MAXFLOW_INFINITY (integer energies of a
+    typical image are kept exact). Returns (graph, source, sink).
+    """
+    height, width = energy_map.shape
+    num_pixels = height * width
+    source_node = num_pixels
+    sink_node = num_pixels + 1
+
+    # Horizontal arc costs, and the vertical ones of forward energy:
+    # down (i, j) -> (i + 1, j) is cut when the seam steps left into
+    # row i + 1, up (i, j) -> (i - 1, j) when it steps right into row i
+    horizontal = np.asarray(energy_map, dtype=np.float64)
+    down = np.zeros((height, width))
+    up = np.zeros((height, width))
+    cuts_per_row = 1
+    if gray is not None:
+        c_up, c_left, c_right = forward_energy_costs(gray)
+        horizontal = horizontal + c_up
+        down[:-1, 1:] = (c_right - c_up)[1:, :-1]
+        up[1:, 1:] = (c_left - c_up)[1:, 1:]
+        cuts_per_row = 2
+
+    peak = max(float(horizontal.max()), float(down.max()),
+               float(up.max()), 1.0)
+    limit = (MAXFLOW_INFINITY - 1) / (cuts_per_row * height)
+    integral = all(np.array_equal(a, np.round(a))
+                   for a in (horizontal, down, up))
+    scale = 1.0 if integral and peak <= limit else limit / peak
+
+    # Arcs out of (i, j), in increasing target order: up-left diagonal,
+    # up, backward, forward, down-left diagonal, down, sink (last
+    # column only)
+    rows = np.arange(height, dtype=np.int32)[:, None]
+    cols = np.arange(width, dtype=np.int32)[None, :]
+    node = rows * width + cols
+    last = cols == width - 1
+    vertical = gray is not None
+    targets = np.stack(np.broadcast_arrays(
+        node - width - 1, node - width, node - 1, node + 1,
+        node + width - 1, node + width, np.full_like(node, sink_node),
+    ), axis=-1)
+    valid = np.stack(np.broadcast_arrays(
+        (rows > 0) & (cols > 0),
+        (rows > 0) & (cols > 0) & vertical,
+        cols > 0,
+        ~last,
+        (rows < height - 1) & (cols > 0),
+        (rows < height - 1) & (cols > 0) & vertical,
+        last,
+    ), axis=-1)
+    caps = np.full(targets.shape, MAXFLOW_INFINITY, dtype=np.int32)
+    caps[:, :, 1] = np.rint(up * scale)
+    caps[:, :, 3] = np.rint(horizontal * scale)
+    caps[:, :, 5] = np.rint(down * scale)
+    caps[:, :, 6] = caps[:, :, 3]
+
+    degree = np.zeros(num_pixels + 2, dtype=np.int32)
+    degree[:num_pixels] = valid.sum(axis=2).ravel()
+    degree[source_node] = height
+
+    indptr = np.zeros(num_pixels + 3, dtype=np.int32)
+    np.cumsum(degree, out=indptr[1:])
+    indices = np.concatenate([targets[valid], rows.ravel() * width])
+    data = np.concatenate([
+        caps[valid], np.full(height, MAXFLOW_INFINITY, dtype=np.int32)
+    ])
+
+    graph = csr_matrix((data, indices.astype(np.int32), indptr),
+                       shape=(num_pixels + 2, num_pixels + 2))
+    return graph, source_node, sink_node
+
+
+def find_vertical_seam_min_cut(energy_map, gray=None):
+    """
+    Finds the lowest-energy vertical seam as a minimum s-t cut of the
+    graph from build_cut_graph(), solved with Dinic's max-flow
+    algorithm (scipy.sparse.csgraph.maximum_flow). Pass 'gray' to
+    include forward energy.
+
+    The pixels reachable from the source in the residual graph form the
+    left side of the cut; the seam is the last such pixel of each row.
+    """
+    height, width = energy_map.shape
+    graph, source_node, sink_node = build_cut_graph(energy_map, gray)
+
+    result = maximum_flow(graph, source_node, sink_node, method='dinic')
+
+    # Residual capacities (reverse arcs of used ones included)
+    residual = (graph - result.flow).tocsr()
+    residual.data[residual.data < 0] = 0
+    residual.eliminate_zeros()
+    reachable = breadth_first_order(
+        residual, source_node, directed=True, return_predecessors=False
+    )
+
+    left = np.zeros(height * width + 2, dtype=bool)
+    left[reachable] = True
+    left_counts = left[:height * width].reshape(height, width).sum(axis=1)
+    return (left_counts - 1).astype(np.uint32)
+
+
+def split_seam_graph(seam_graph):
+    """
+    Node-split form of a seam graph for min-cost flow.
+
+    Every pixel node n becomes an in-node n and an out-node
+    num_nodes + n joined by an edge of cost 0; an edge u -> v of the
+    seam graph becomes out(u) -> v with the same cost. With unit
+    capacities on all edges, a flow of k units is then k seams that
+    share no pixel. The source and sink are not split.
+
+    Returns (tails, heads, costs, out_nodes): int64 edge arrays sorted
+    by (tail, head), float64 costs and the out-node of every node.
+    """
+    graph = seam_graph.graph
+    num_nodes = seam_graph.num_nodes
+    nodes = np.arange(num_nodes, dtype=np.int64)
+    pixels = nodes[seam_graph.node_columns[:num_nodes] >= 0]
+    out_nodes = nodes.copy()
+    out_nodes[pixels] += num_nodes
+
+    tails = np.concatenate([
+        out_nodes[np.repeat(nodes, np.diff(graph.indptr))], pixels,
+    ])
+    heads = np.concatenate([graph.indices.astype(np.int64), out_nodes[pixels]])
+    costs = np.concatenate([
+        graph.data.astype(np.float64), np.zeros(len(pixels)),
+    ])
+
+    order = np.argsort(tails * (2 * num_nodes) + heads, kind='stable')
+    return tails[order], heads[order], costs[order], out_nodes
+
+
+def min_cost_flow(tails, heads, costs, source, sink, count, num_nodes):
+    """
+    Sends up to 'count' units from 'source' to 'sink' through unit
+    capacity edges at minimum total cost, by successive shortest paths.
+
+    Each unit follows the shortest path of the residual graph (unused
+    edges forward, used edges backward at negated cost), found with
+    Dijkstra on costs made non-negative by node potentials (Johnson),
+    so augmenting paths may undo parts of earlier ones. Stops early
+    when the sink becomes unreachable. Returns a boolean array marking
+    the edges that carry flow.
+    """
+    used = np.zeros(len(tails), dtype=bool)
+    potentials = np.zeros(num_nodes)
+    keys = tails * num_nodes + heads
+
+    for _ in range(count):
+        reduced = costs + potentials[tails] - potentials[heads]
+        reduced = np.maximum(np.where(used, -reduced, reduced), 0.0)
+        residual = csr_matrix(
+            (reduced, (np.where(used, heads, tails),
+                       np.where(used, tails, heads))),
+            shape=(num_nodes, num_nodes)
+        )
+        distances, predecessors = shortest_path(
+            csgraph=residual, directed=True, indices=source,
+            return_predecessors=True
+        )
+        if not np.isfinite(distances[sink]):
+            break
+
+        path = [sink]
+        while path[-1] != source:
+            path.append(predecessors[path[-1]])
+        path = np.array(path[::-1], dtype=np.int64)
+
+        # Each step uses an unused edge forward or a used one backward
+        forward = np.searchsorted(keys, path[:-1] * num_nodes + path[1:])
+        forward = np.minimum(forward, len(keys) - 1)
+        is_forward = (keys[forward] == path[:-1] * num_nodes + path[1:])
+        is_forward &= ~used[forward]
+        backward = np.searchsorted(keys, path[1:] * num_nodes + path[:-1])
+        steps = np.where(is_forward, forward, backward)
+        used[steps] = is_forward
+
+        # Nodes beyond the sink keep their reduced costs non-negative
+        potentials += np.minimum(distances, distances[sink])
+
+    return used
+
+
+def find_disjoint_seams_min_cost_flow(energy_map, gray=None, count=1):
+    """
+    Finds 'count' vertical seams that share no pixel and have the
+    lowest total energy, with one min-cost flow over the node-split
+    seam graph (split_seam_graph(), min_cost_flow()) instead of one
+    graph solve per seam. Pass 'gray' to include forward energy.
+
+    Returns a (num_seams, height) uint32 array, ordered by the column
+    each seam starts at. Fewer seams are returned only when the image
+    is narrower than 'count'.
+    """
+    height, width = energy_map.shape
+    count = min(count, width)
+    seam_graph = build_seam_graph(energy_map, gray)
+    num_nodes = seam_graph.num_nodes
+
+    tails, heads, costs, out_nodes = split_seam_graph(seam_graph)
+    used = min_cost_flow(tails, heads, costs, seam_graph.source,
+                         seam_graph.sink, count, 2 * num_nodes)
+    if not used.any():
+        raise UnreachableSinkError("no seam reaches the last row")
+
+    # Follow the flow: every used pixel has exactly one used edge out
+    next_node = np.full(2 * num_nodes, -1, dtype=np.int64)
+    next_node[tails[used]] = heads[used]
+    nodes = np.sort(heads[used & (tails == seam_graph.source)])
+    seams = np.empty((len(nodes), height), dtype=np.int64)
+    for i in range(height):
+        seams[:, i] = seam_graph.node_columns[nodes]
+        nodes = next_node[out_nodes[nodes]]
+    return seams.astype(np.uint32)
+
+
+def find_vertical_seam_shortest_path(energy_map, gray=None,
+                                     solver='dijkstra', graph=None,
+                                     band=None, hint=None, paths=None,
+                                     expanded=None):
+    """
+    Finds the lowest-energy vertical seam by building a graph and
+    finding the shortest path from a virtual 'source' to 'sink'.
+    Pass 'gray' to include forward energy. 'solver' is a name from
+    SOLVERS. Pass a ReusableSeamGraph as 'graph' to reuse one graph
+    across calls instead of building one.
+
+    With 'band', only a corridor of +/- band columns around 'hint' (by
+    default coarse_seam_hint()) is searched, so the graph size does not
+    depend on the image width.
+
+    Pass an IncrementalShortestPaths as 'paths' to update the shortest
+    paths of the previous call after its seam was removed instead of
+    solving the graph again ('solver' and 'graph' are then unused).
+    With solver 'astar', the number of nodes expanded is appended to
+    the list 'expanded', if given.
+    """
+    height = energy_map.shape[0]
+    if paths is not None:
+        seam_graph, distances, predecessors = paths.solve(energy_map, gray)
+        paths.seam = recover_seam(seam_graph, distances, predecessors,
+                                  height)
+        return paths.seam
+
+    if band:
+        if hint is None:
+            hint = coarse_seam_hint(energy_map)
+        seam_graph = build_banded_seam_graph(energy_map, hint, band, gray)
+    elif graph is None:
+        seam_graph = build_seam_graph(energy_map, gray)
+    else:
+        seam_graph = graph.update(energy_map, gray)
+
+    # --- Compute Shortest Path ---
+    # Find shortest path from the source to all other nodes
+    if solver == 'astar' and expanded is not None:
+        distances, predecessors = shortest_path_astar(seam_graph, expanded)
+    else:
+        distances, predecessors = SOLVERS[solver](seam_graph)
+
+    return recover_seam(seam_graph, distances, predecessors, height)
 
 
 def main():
-    parser = argparse.ArgumentParser(
-        description="Graph-Based Seam Carving (Shortest Path)"
+    parser = build_parser("Graph-Based Seam Carving (Shortest Path)")
+    parser.add_argument(
+        "--solver",
+        type=str,
+        default="dijkstra",
+        choices=sorted(SOLVERS) + ["maxflow"],
+        help="Generic Dijkstra, row-by-row relaxation of the layered "
+             "seam graph (dag, same seam cost, much faster), A* search "
+             "bounded by the row minima (astar, expands few nodes when "
+             "the image has a clear low-energy channel), or a true "
+             "min-cut solved with Dinic's max-flow (maxflow)",
     )
     parser.add_argument(
-        "input_image", type=str, help="Path to the input image"
+        "--band",
+        type=int,
+        default=0,
+        help="Only search +/- this many columns around a seam estimated "
+             f"on a {BAND_PYRAMID_FACTOR}x smaller pyramid level "
+             "(0 = whole image)",
     )
     parser.add_argument(
-        "output_image", type=str, help="Path to save the carved image"
+        "--forward_energy", "--forward-energy",
+        action="store_true",
+        help="Add forward energy: the cost of the new edges a seam "
+             "creates, which depends on its direction (C_L, C_U, C_R)",
     )
     parser.add_argument(
-        "--num_seams",
+        "--batch_seams", "--batch-seams",
         type=int,
-        default=50,
-        help="Number of seams to remove",
+        default=0,
+        help="Find this many disjoint seams of minimum total energy with "
+             "one min-cost flow and remove them at once (0 = one seam "
+             "per solve)",
     )
     parser.add_argument(
-        "--direction",
-        type=str,
-        default="vertical",
-        choices=["vertical", "horizontal"],
-        help="Direction of seams to remove",
+        "--incremental",
+        action="store_true",
+        help="Keep the shortest paths between seams and only re-relax "
+             "the nodes below the removed seam (--solver does the first "
+             "full solve)",
     )
-    
     args = parser.parse_args()
 
-    input_image_path = find_image_path(args.input_image)
-
-    if input_image_path is None:
-        print(f"Error: Unable to find image file for '{args.input_image}'")
+    if args.band < 0:
+        print("Error: --band must be 0 (off) or a positive column count")
         sys.exit(1)
-
-    image = cv2.imread(input_image_path)
-    
-    if image is None:
-        print(f"Error: Unable to read image from {args.input_image}")
+    if args.batch_seams < 0:
+        print("Error: --batch_seams must be 0 (off) or a positive count")
+        sys.exit(1)
+    if args.incremental and (args.solver in ("maxflow", "astar")
+                             or args.band or args.batch_seams):
+        print("Error: --incremental needs the full shortest path tree of "
+              "--solver dijkstra or dag (no --band or --batch_seams)")
         sys.exit(1)
 
-    print(f"Original image size: {image.shape}")
-    start = time.time()
-    
-    carved_image = carve(image, args.num_seams, args.direction)
-    
-    print(f"Carved image size: {carved_image.shape}")
-    end = time.time()
-    print(f"Time Taken: {end - start:.4f} seconds")
+    # Nodes expanded by every A* search
+    expanded = [] if args.solver == "astar" else None
+
+    seams_per_pass = 1
+    label = "Graph-Shortest-Path"
+    if args.batch_seams:
+        if args.solver == "maxflow" or args.band:
+            print("Error: --batch_seams uses its own min-cost flow solver "
+                  "and cannot be combined with --solver maxflow or --band")
+            sys.exit(1)
+        seam_finder = partial(find_disjoint_seams_min_cost_flow)
+        seam_finder.batched = True
+        seams_per_pass = args.batch_seams
+        label = "Graph-Min-Cost-Flow"
+    elif args.solver == "maxflow":
+        if args.band:
+            print("Error: --band is only supported by the shortest path "
+                  "solvers")
+            sys.exit(1)
+        seam_finder = partial(find_vertical_seam_min_cut)
+        label = "Graph-Min-Cut"
+    elif args.band:
+        seam_finder = partial(find_vertical_seam_shortest_path,
+                              solver=args.solver, band=args.band,
+                              expanded=expanded)
+    elif args.incremental:
+        paths = IncrementalShortestPaths(args.solver)
+        seam_finder = partial(find_vertical_seam_shortest_path, paths=paths)
+    else:
+        # One graph reused for every seam (weights updated in place)
+        seam_finder = partial(find_vertical_seam_shortest_path,
+                              solver=args.solver, graph=ReusableSeamGraph(),
+                              expanded=expanded)
+
+    # Forward energy needs the (carved) grayscale image as well
+    seam_finder.needs_gray = args.forward_energy
+
+    run(args, seam_finder, label, seams_per_pass)
+
+    if args.incremental:
+        solves = max(paths.full_solves + paths.updates, 1)
+        print(f"Shortest paths: {paths.full_solves} full solve(s), "
+              f"{paths.updates} incremental update(s), "
+              f"{paths.relaxed_nodes / solves:.0f} nodes relaxed per seam")
 
-    cv2.imwrite(args.output_image, carved_image)
-    print(f"Successfully saved carved image to {args.output_image}")
+    if expanded:
+        print(f"A* search: {np.mean(expanded):.0f} nodes expanded per seam "
+              f"(min {min(expanded)}, max {max(expanded)})")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
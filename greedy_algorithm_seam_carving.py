@@ -2,48 +2,12 @@
 """Greedy Algorithm Seam Carving
 """
 
-import cv2
-import numpy as np
-import argparse
 import sys
-import time
-import os
-
-
-def compute_energy(image):
-    """
-    Calculates the energy map of an image using the Sobel operator.
-    The energy of a pixel is the sum of the absolute values of the
-    gradients in the x and y directions.
-    (Identical to the DP version)
-    """
-    # Convert image to grayscale for energy calculation
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-    # Compute gradients in x and y directions using Sobel filter
-    sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-    sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-
-    # Compute the energy map as the sum of absolute gradients
-    energy_map = np.abs(sobel_x) + np.abs(sobel_y)
-
-    return energy_map
+from functools import partial
 
+import numpy as np
 
-def draw_seam(image, seam, direction):
-    """
-    Draws a seam (vertical or horizontal) on a copy of the image.
-    """
-    display_image = image.copy()
-    if direction == 'vertical':
-        for i in range(len(seam)):
-            # Draw a red pixel at (row, col)
-            display_image[i, seam[i]] = [0, 0, 255] # BGR for red
-    else: # horizontal
-        for j in range(len(seam)):
-            # Draw a red pixel at (col, row)
-            display_image[seam[j], j] = [0, 0, 255] # BGR for red
-    return display_image
+from seam_carving.cli import build_parser, run
 
 
 def find_vertical_seam_greedy(energy_map):
@@ -84,180 +48,248 @@ def find_vertical_seam_greedy(energy_map):
     return seam
 
 
-def remove_vertical_seam(image, seam):
+def find_vertical_seam_greedy_all_starts(energy_map):
     """
-    Removes a given vertical seam from an image.
-    (Identical to the DP version)
+    Runs the greedy walk from every pixel of the first row at once and
+    returns the path with the lowest total energy.
+
+    The greedy move out of a pixel only depends on the 3-pixel
+    neighborhood below it, so the move (ties go left, as in
+    find_vertical_seam_greedy) and its cost are computed for the whole
+    image in one vectorized pass. All W candidate paths then advance
+    together with one gather per row. The cost is about that of one DP
+    pass, and the result is never worse than the single-start greedy
+    seam, which is one of the candidates.
     """
-    height, width, channels = image.shape
-    new_image = np.zeros((height, width - 1, channels), dtype=image.dtype)
+    height, width = energy_map.shape
+
+    # Neighborhoods of every pixel of rows 1..H-1, padded with inf
+    padded = np.pad(energy_map[1:], ((0, 0), (1, 1)),
+                    constant_values=np.inf)
+    left, center, right = padded[:, :-2], padded[:, 1:-1], padded[:, 2:]
+
+    # Greedy move (-1, 0, +1) out of every pixel and the energy it adds
+    move = (center < left).view(np.int8) - np.int8(1)
+    best = np.minimum(left, center)
+    np.putmask(move, right < best, 1)
+    np.minimum(best, right, out=best)
+    destination = move.astype(np.int32)
+    destination += np.arange(width, dtype=np.int32)
+    # With inf below (a masked map), a tie can pick the left padding
+    np.clip(destination, 0, width - 1, out=destination)
+
+    paths = np.empty((height, width), dtype=np.int32)
+    positions = np.arange(width, dtype=np.int32)
+    paths[0] = positions
+    costs = energy_map[0].astype(np.float64)
+
+    for i in range(1, height):
+        costs += best[i - 1].take(positions)
+        positions = destination[i - 1].take(positions)
+        paths[i] = positions
+
+    return paths[:, np.argmin(costs)].astype(np.uint32)
 
-    for i in range(height):
-        col_to_remove = seam[i]
-        new_image[i, :col_to_remove] = image[i, :col_to_remove]
-        new_image[i, col_to_remove:] = image[i, col_to_remove + 1:]
 
-    return new_image
+# Default number of partial paths kept per row by the beam search
+DEFAULT_BEAM_WIDTH = 16
 
 
-def carve(image, num_seams, direction, visualize=False):
+def find_vertical_seam_beam(energy_map, beam_width=DEFAULT_BEAM_WIDTH):
     """
-    Repeatedly finds and removes seams from an image.
-    'visualize=True' will show each seam before removal.
+    Finds a vertical seam with a beam search that keeps the 'beam_width'
+    cheapest partial paths per row.
+
+    Every row, each path in the beam is extended to its (up to) 3
+    neighbors below, all at once. Candidates ending in the same column
+    are deduplicated, keeping the cheapest, since only that one can lead
+    to the best seam through that pixel. The cheapest 'beam_width'
+    columns form the next beam. beam_width=1 is the single-start greedy
+    search and beam_width >= width is an exact DP, so the beam width is
+    a quality/speed dial between the two.
     """
-    carved_image = np.copy(image)
-    
-    # Store the original for visualization
-    original_for_viz = np.copy(image)
-
-    for k in range(num_seams):
-        
-        # --- Visualization logic ---
-        if visualize:
-            # We must use the 'carved_image' for calculation
-            # but we can show the seam on the 'original' for comparison
-            # Note: This visualization isn't perfect, as seam coordinates
-            # shift, but it's good for demonstration.
-            # For a simpler viz, just use 'carved_image' in draw_seam.
-            
-            viz_img = np.copy(carved_image)
-            
-            # Find seam on the (potentially transposed) carved image
-            if direction == "horizontal":
-                energy_map = compute_energy(viz_img.transpose(1, 0, 2))
-                seam = find_vertical_seam_greedy(energy_map)
-                
-                # Draw on the *non-transposed* image
-                viz_img = draw_seam(viz_img, seam, 'horizontal')
-
-            else: # vertical
-                energy_map = compute_energy(viz_img)
-                seam = find_vertical_seam_greedy(energy_map)
-                
-                # Draw on the image
-                viz_img = draw_seam(viz_img, seam, 'vertical')
-            
-            print(f"Showing seam {k + 1}/{num_seams}. Press any key to continue...")
-            cv2.imshow("Seam Visualization (press any key)", viz_img)
-            cv2.waitKey(0) # Wait for a key press
-        # --- End visualization logic ---
-
-
-        # --- Carving logic ---
-        
-        # Transpose for horizontal seam removal
-        if direction == "horizontal":
-            carved_image = carved_image.transpose(1, 0, 2)
-
-        # Compute energy map
-        # If we visualized, we already have the energy_map and seam
-        if not visualize:
-            energy_map = compute_energy(carved_image)
-            seam = find_vertical_seam_greedy(energy_map)
-
-        # Remove the seam
-        carved_image = remove_vertical_seam(carved_image, seam)
-
-        # Transpose back if horizontal
-        if direction == "horizontal":
-            carved_image = carved_image.transpose(1, 0, 2)
-
-        # Print progress (use end='\r' to stay on one line)
-        print(f"Removed seam {k + 1}/{num_seams}", end='\r')
-    
-    print("\nDone.") # Newline after loop
-    
-    # Clean up any open windows
-    if visualize:
-        cv2.destroyAllWindows()
-
-    return carved_image
-
-
-def find_image_path(input_path):
+    height, width = energy_map.shape
+    beam_width = max(1, min(int(beam_width), width))
+
+    # Start from the cheapest pixels of the first row (ties go left)
+    columns = np.argsort(energy_map[0], kind='stable')[:beam_width]
+    columns = columns.astype(np.intp)
+    costs = energy_map[0, columns].astype(np.float64)
+
+    # parents[i, b]: beam slot in row i-1 that path b of row i extends
+    parents = np.empty((height, beam_width), dtype=np.intp)
+    beam_columns = np.empty((height, beam_width), dtype=np.intp)
+    beam_columns[0] = columns
+
+    offsets = np.array([-1, 0, 1], dtype=np.intp)
+    slots = np.repeat(np.arange(beam_width, dtype=np.intp), 3)
+
+    for i in range(1, height):
+        candidates = (columns[:, None] + offsets).ravel()
+        valid = (candidates >= 0) & (candidates < width)
+        candidates = candidates[valid]
+        sources = slots[valid]
+        candidate_costs = costs[sources] + energy_map[i, candidates]
+
+        # Cheapest candidate per column, then the cheapest columns. Each
+        # beam column yields a distinct straight-down candidate, so there
+        # are always at least beam_width distinct columns.
+        order = np.argsort(candidate_costs, kind='stable')
+        _, first = np.unique(candidates[order], return_index=True)
+        chosen = order[np.sort(first)[:beam_width]]
+
+        columns = candidates[chosen]
+        costs = candidate_costs[chosen]
+        parents[i] = sources[chosen]
+        beam_columns[i] = columns
+
+    # Backtrack from the cheapest complete path
+    seam = np.empty(height, dtype=np.uint32)
+    slot = int(np.argmin(costs))
+    for i in range(height - 1, -1, -1):
+        seam[i] = beam_columns[i, slot]
+        slot = parents[i, slot]
+
+    return seam
+
+
+# Default number of rows the lookahead greedy search looks ahead
+DEFAULT_LOOKAHEAD = 3
+
+
+def _lookahead_costs(slab):
     """
-    Finds a valid image path.
-    If 'input_path' is not found, it tries appending
-    .jpg, .jpeg, and .png.
+    Min-plus pass over a (depth, n) slab of energies: returns the cost
+    of the cheapest depth-row path starting in the first row, for the
+    columns depth-1 .. n-depth of the slab.
     """
-    if os.path.exists(input_path):
-        return input_path
+    depth, n = slab.shape
+    costs = slab[-1]
+    for r in range(depth - 2, -1, -1):
+        margin = depth - 1 - r
+        costs = slab[r, margin:n - margin] + np.minimum(
+            np.minimum(costs[:-2], costs[1:-1]), costs[2:]
+        )
+    return costs
 
-    # Check for other extensions
-    for ext in ['.jpg', '.jpeg', '.png']:
-        path_with_ext = input_path + ext
-        if os.path.exists(path_with_ext):
-            print(f"Input '{input_path}' not found, using '{path_with_ext}'")
-            return path_with_ext
 
-    # Check if user already included extension but file is missing
-    base, ext = os.path.splitext(input_path)
-    if ext in ['.jpg', '.jpeg', '.png']:
-         if os.path.exists(base):
-            print(f"Input '{input_path}' not found, using '{base}'")
-            return base
+def find_vertical_seam_lookahead(energy_map, lookahead=DEFAULT_LOOKAHEAD):
+    """
+    Finds a vertical seam with a greedy walk that looks 'lookahead'
+    rows ahead.
+
+    At each row the walk moves to the neighbor below that starts the
+    cheapest path over the next 'lookahead' rows, instead of the
+    cheapest pixel. That path cost comes from a small min-plus DP over
+    the (2 * lookahead + 1) wide cone below the current pixel, so a
+    step costs O(lookahead^2) regardless of the image width and a seam
+    O(height * lookahead^2). The DP runs bottom-up, and each step's
+    window gains a new bottom row that changes every cost above it, so
+    the DP is redone per step rather than updated in O(lookahead).
+    lookahead=1 is the plain greedy walk (find_vertical_seam_greedy).
+    """
+    height, width = energy_map.shape
+    k = max(1, int(lookahead))
+    seam = np.zeros(height, dtype=np.uint32)
+
+    # Columns outside the image are never chosen
+    padded = np.pad(energy_map.astype(np.float64), ((0, 0), (k, k)),
+                    constant_values=np.inf)
+
+    # Start where the cheapest path over the first rows starts
+    depth = min(k, height)
+    start = k - depth + 1
+    costs = _lookahead_costs(padded[:depth])[start:start + width]
+    current_col = int(np.argmin(costs))
+    seam[0] = current_col
+
+    for i in range(1, height):
+        depth = min(k, height - i)
+
+        # Cone below the current pixel whose DP yields the path costs
+        # starting at columns current_col-1 .. current_col+1 of row i
+        c0 = current_col + k - depth
+        costs = _lookahead_costs(padded[i:i + depth, c0:c0 + 2 * depth + 1])
+
+        # Ties go left; never leave the image even if all are infinite
+        current_col = max(current_col - 1 + int(np.argmin(costs)), 0)
+        seam[i] = current_col
+
+    return seam
 
-    return None
+
+GREEDY_MODES = {
+    'single': find_vertical_seam_greedy,
+    'all-starts': find_vertical_seam_greedy_all_starts,
+}
 
 
 def main():
-    parser = argparse.ArgumentParser(
-        description="Greedy Algorithm Seam Carving" # <-- Change for Greedy
-    )
-    parser.add_argument(
-        "input_image", type=str, help="Path to the input image"
-    )
+    parser = build_parser("Greedy Algorithm Seam Carving")
     parser.add_argument(
-        "output_image", type=str, help="Path to save the carved image"
+        "--greedy_mode", "--greedy-mode",
+        type=str,
+        default="single",
+        choices=sorted(GREEDY_MODES),
+        help="Start from the lowest pixel of the first row (single) "
+             "or from every pixel, keeping the cheapest path (all-starts)",
     )
     parser.add_argument(
-        "--num_seams",
+        "--beam",
         type=int,
-        default=50,
-        help="Number of seams to remove",
+        default=0,
+        help="Use a beam search keeping this many paths per row instead "
+             "of the greedy walk (0 = off; larger is slower but closer "
+             f"to DP, e.g. {DEFAULT_BEAM_WIDTH})",
     )
     parser.add_argument(
-        "--direction",
-        type=str,
-        default="vertical",
-        choices=["vertical", "horizontal"],
-        help="Direction of seams to remove",
+        "--lookahead",
+        type=int,
+        default=0,
+        help="Greedy walk that picks each move by the cheapest path over "
+             "this many rows (0 = off, 1 = plain greedy; e.g. "
+             f"{DEFAULT_LOOKAHEAD}). Each row costs O(k^2) for k rows, "
+             "not O(k): the path costs come from a small DP per step",
     )
     parser.add_argument(
-        "--visualize",
-        action="store_true",
-        help="Show each seam before removing it",
+        "--seams_per_pass", "--seams-per-pass",
+        type=int,
+        default=1,
+        help="Trace up to this many non-overlapping seams on each energy "
+             "map and remove them together (fewer energy passes)",
     )
-
     args = parser.parse_args()
 
-    input_image_path = find_image_path(args.input_image)
-
-    if input_image_path is None:
-        print(f"Error: Unable to find image file for '{args.input_image}'")
+    if args.beam < 0:
+        print("Error: --beam must be 0 (off) or a positive beam width")
         sys.exit(1)
 
-    image = cv2.imread(input_image_path)
-    
-    if image is None:
-        print(f"Error: Unable to read image from {args.input_image}")
+    if args.lookahead < 0:
+        print("Error: --lookahead must be 0 (off) or a positive row count")
         sys.exit(1)
 
-    print(f"Original image size: {image.shape}")
+    if args.beam > 0 and args.lookahead > 0:
+        print("Error: --beam and --lookahead cannot be combined")
+        sys.exit(1)
 
-    # record start time
-    start = time.time()
+    if args.greedy_mode != 'single' and (args.beam > 0 or args.lookahead > 0):
+        print("Error: --greedy_mode cannot be combined with --beam or "
+              "--lookahead")
+        sys.exit(1)
 
-    carved_image = carve(image, args.num_seams, args.direction, args.visualize)
-    
-    print(f"Carved image size: {carved_image.shape}")
+    if args.seams_per_pass < 1:
+        print("Error: --seams_per_pass must be at least 1")
+        sys.exit(1)
 
-    # record end time
-    end = time.time()
-    print(f"Time Taken: {end - start:.4f} seconds")
+    if args.beam > 0:
+        seam_finder = partial(find_vertical_seam_beam, beam_width=args.beam)
+    elif args.lookahead > 0:
+        seam_finder = partial(find_vertical_seam_lookahead,
+                              lookahead=args.lookahead)
+    else:
+        seam_finder = GREEDY_MODES[args.greedy_mode]
 
-    cv2.imwrite(args.output_image, carved_image)
-    print(f"Successfully saved carved image to {args.output_image}")
+    run(args, seam_finder, seams_per_pass=args.seams_per_pass)
 
 
 if __name__ == "__main__":
@@ -7,33 +7,15 @@ import argparse
 import sys
 import os
 
+from seam_carving import (
+    find_image_path,
+    load_seam_history,
+    render_seam_heatmap,
+)
 
-def find_image_path(input_path):
-    """
-    Finds a valid image path.
-    If 'input_path' is not found, it tries appending
-    .jpg, .jpeg, and .png.
-    """
-    if os.path.exists(input_path):
-        return input_path
-
-    # Check for other extensions
-    for ext in ['.jpg', '.jpeg', '.png']:
-        path_with_ext = input_path + ext
-        if os.path.exists(path_with_ext):
-            print(f"Input '{input_path}' not found, using '{path_with_ext}'")
-            return path_with_ext
-
-    # Check if user already included extension but file is missing
-    base, ext = os.path.splitext(input_path)
-    if ext in ['.jpg', '.jpeg', '.png']:
-         if os.path.exists(base):
-            print(f"Input '{input_path}' not found, using '{base}'")
-            return base
-
-    return None
-
-def create_comparison_image(input_path, output_path, layout='vertical'):
+
+def create_comparison_image(input_path, output_path, layout='vertical',
+                            seams_path=None, heatmap_mode='order'):
     """
     Creates a comparison image showing input above and output below
     (or side-by-side).
@@ -42,6 +24,9 @@ def create_comparison_image(input_path, output_path, layout='vertical'):
         input_path: Path to the original/input image
         output_path: Path to the carved/output image
         layout: 'vertical' (stacked) or 'horizontal' (side-by-side)
+        seams_path: Optional seam history (.npz from --save_seams);
+            adds a third panel with all removed seams
+        heatmap_mode: 'order' (color by removal order) or 'all'
 
     Returns:
         Combined comparison image
@@ -64,56 +49,60 @@ def create_comparison_image(input_path, output_path, layout='vertical'):
     output_h, output_w = output_img.shape[:2]
 
     # Add labels to images
-    input_labeled = add_label(
-        input_img.copy(), f"Original ({input_w}x{input_h})"
-    )
-    output_labeled = add_label(
-        output_img.copy(), f"Carved ({output_w}x{output_h})"
-    )
+    panels = [
+        add_label(input_img.copy(), f"Original ({input_w}x{input_h})"),
+        add_label(output_img.copy(), f"Carved ({output_w}x{output_h})"),
+    ]
+
+    if seams_path is not None:
+        seams, direction, shape = load_seam_history(seams_path)
+        if shape != (input_h, input_w):
+            print(f"Error: Seam history {seams_path} was recorded on a "
+                  f"{shape[1]}x{shape[0]} image, not {input_w}x{input_h}")
+            sys.exit(1)
+        heatmap = render_seam_heatmap(input_img, seams, direction,
+                                      heatmap_mode)
+        panels.append(
+            add_label(heatmap, f"Removed seams ({len(seams)} {direction})")
+        )
 
     if layout == 'vertical':
         # Stack vertically (input above, output below)
-        # Make both images the same width for clean stacking
-        max_width = max(input_w, output_w)
+        # Make all images the same width for clean stacking
+        max_width = max(panel.shape[1] for panel in panels)
 
         # Resize if needed to match widths
-        if input_w != max_width:
-            scale = max_width / input_w
-            new_h = int(input_h * scale)
-            input_labeled = cv2.resize(input_labeled, (max_width, new_h))
-
-        if output_w != max_width:
-            scale = max_width / output_w
-            new_h = int(output_h * scale)
-            output_labeled = cv2.resize(output_labeled, (max_width, new_h))
+        for k, panel in enumerate(panels):
+            h, w = panel.shape[:2]
+            if w != max_width:
+                new_h = int(h * max_width / w)
+                panels[k] = cv2.resize(panel, (max_width, new_h))
 
-        # Add separator line
+        # Add separator lines
         separator = np.ones((5, max_width, 3), dtype=np.uint8) * 255
-
-        # Stack images
-        comparison = np.vstack([input_labeled, separator, output_labeled])
+        stack = np.vstack
 
     else:  # horizontal layout
         # Place side-by-side
-        # Make both images the same height for clean alignment
-        max_height = max(input_h, output_h)
+        # Make all images the same height for clean alignment
+        max_height = max(panel.shape[0] for panel in panels)
 
         # Resize if needed to match heights
-        if input_h != max_height:
-            scale = max_height / input_h
-            new_w = int(input_w * scale)
-            input_labeled = cv2.resize(input_labeled, (new_w, max_height))
-
-        if output_h != max_height:
-            scale = max_height / output_h
-            new_w = int(output_w * scale)
-            output_labeled = cv2.resize(output_labeled, (new_w, max_height))
+        for k, panel in enumerate(panels):
+            h, w = panel.shape[:2]
+            if h != max_height:
+                new_w = int(w * max_height / h)
+                panels[k] = cv2.resize(panel, (new_w, max_height))
 
-        # Add separator line
+        # Add separator lines
         separator = np.ones((max_height, 5, 3), dtype=np.uint8) * 255
+        stack = np.hstack
 
-        # Stack images horizontally
-        comparison = np.hstack([input_labeled, separator, output_labeled])
+    # Interleave panels with separators
+    pieces = [panels[0]]
+    for panel in panels[1:]:
+        pieces += [separator, panel]
+    comparison = stack(pieces)
 
     return comparison
 
@@ -174,6 +163,19 @@ def main():
         action='store_true',
         help='Display the comparison in a window (press any key to close)'
     )
+    parser.add_argument(
+        '--seams',
+        type=str,
+        default=None,
+        help='Seam history (.npz from --save_seams) to show as an extra panel'
+    )
+    parser.add_argument(
+        '--heatmap_mode',
+        type=str,
+        default='order',
+        choices=['order', 'all'],
+        help='Color removed seams by removal order, or all in red'
+    )
 
     args = parser.parse_args()
 
@@ -195,11 +197,17 @@ def main():
     print(f"Output: {output_path}")
     print(f"Layout: {args.layout}")
 
+    if args.seams is not None and not os.path.exists(args.seams):
+        print(f"Error: Unable to find seam history '{args.seams}'")
+        sys.exit(1)
+
     # Create comparison
     comparison = create_comparison_image(
         input_path,
         output_path,
-        args.layout
+        args.layout,
+        args.seams,
+        args.heatmap_mode
     )
 
     # Save comparison image
@@ -10,119 +10,53 @@ import sys
 import argparse
 import os
 
-# --- Import functions from your existing DP script ---
+# --- Import the shared seam carving core ---
 try:
-    from dynamic_programming_seam_carving import (
-        compute_energy, 
-        find_vertical_seam_dp, 
-        remove_vertical_seam
-    )
+    from seam_carving import ResizeWorker, SeamCache, find_image_path
+    from seam_carving.energy import DEFAULT_ENERGY, ENERGY_FUNCTIONS
 except ImportError:
-    print("Error: Could not find 'dynamic_programming_seam_carving.py'")
+    print("Error: Could not find the 'seam_carving' package")
     print("Please make sure this script is in the same folder.")
     sys.exit(1)
 
 
-def find_image_path(input_path):
-    """
-    Finds a valid image path.
-    If 'input_path' is not found, it tries appending
-    .jpg, .jpeg, and .png.
-    """
-    if os.path.exists(input_path):
-        return input_path
-
-    # Check for other extensions
-    for ext in ['.jpg', '.jpeg', '.png']:
-        path_with_ext = input_path + ext
-        if os.path.exists(path_with_ext):
-            print(f"Input '{input_path}' not found, using '{path_with_ext}'")
-            return path_with_ext
-
-    # Check if user already included extension but file is missing
-    base, ext = os.path.splitext(input_path)
-    if ext in ['.jpg', '.jpeg', '.png']:
-         if os.path.exists(base):
-            print(f"Input '{input_path}' not found, using '{base}'")
-            return base
-
-    return None
-
-# --- We need a modified carve function that works on a copy ---
-def carve(image, num_seams, direction):
-    """
-    Carves an image. This version is simplified for the
-    interactive tool and doesn't have visualization.
-    """
-    carved_image = np.copy(image)
-
-    for k in range(num_seams):
-        if direction == "horizontal":
-            carved_image = carved_image.transpose(1, 0, 2)
-
-        energy_map = compute_energy(carved_image)
-        seam = find_vertical_seam_dp(energy_map)
-        carved_image = remove_vertical_seam(carved_image, seam)
-
-        if direction == "horizontal":
-            carved_image = carved_image.transpose(1, 0, 2)
-        
-        # Update progress in the console
-        print(f"Removing {direction} seam {k + 1}/{num_seams}   ", end='\r')
+def show_progress(done, total):
+    """Prints the pre-compute progress as a percentage."""
+    percent = 100 * done // max(total, 1)
+    print(f"Pre-computing seam cache: {percent}%   ", end='\r')
 
-    return carved_image
 
 # --- Global variables to store image and state ---
 original_image = None
 current_image = None
+worker = None
 window_name = "Interactive Seam Carving"
 TRACKBARS_INITIALIZED = False
 
 def update_image():
     """
-    Callback function for when sliders have changed.
+    Callback function for when sliders have changed. Only hands the
+    new size to the background worker; show_frame() displays the
+    result once it is ready.
     """
-    global original_image, current_image, window_name, TRACKBARS_INITIALIZED
-
     if not TRACKBARS_INITIALIZED:
         return
     
-    # Get current slider positions
-    target_width_seams = cv2.getTrackbarPos("Width", window_name)
-    target_height_seams = cv2.getTrackbarPos("Height", window_name)
-    
-    h, w = original_image.shape[:2]
-    
-    # Calculate how many seams to remove
-    seams_to_remove_v = w - target_width_seams
-    seams_to_remove_h = h - target_height_seams
-    
-    # Check if a change is actually needed
-    if seams_to_remove_v == 0 and seams_to_remove_h == 0:
-        current_image = original_image.copy() # Reset to original
-    else:
-        print("\n--- New Request ---")
-        print(f"Target size: {target_width_seams}w x {target_height_seams}h")
-        
-        # Start from a fresh copy of the original image
-        temp_image = np.copy(original_image)
-        
-        # 1. Carve Vertically (Width)
-        if seams_to_remove_v > 0:
-            print(f"Removing {seams_to_remove_v} vertical seams...")
-            temp_image = carve(temp_image, seams_to_remove_v, "vertical")
-        
-        # 2. Carve Horizontally (Height)
-        if seams_to_remove_h > 0:
-            print(f"Removing {seams_to_remove_h} horizontal seams...")
-            temp_image = carve(temp_image, seams_to_remove_h, "horizontal")
-            
-        print("\nUpdate complete.")
-        
-        # Update the global current image
-        current_image = temp_image
+    # Get current slider positions (never carve to an empty image)
+    target_width = max(cv2.getTrackbarPos("Width", window_name), 1)
+    target_height = max(cv2.getTrackbarPos("Height", window_name), 1)
     
-    # --- Display the final image ---
+    worker.request(target_width, target_height)
+
+
+def show_frame(frame):
+    """
+    Displays a carved image on a canvas of the original size.
+    """
+    global current_image
+
+    current_image = frame
+
     display_h, display_w = original_image.shape[:2]
     display_canvas = np.zeros((display_h, display_w, 3), dtype=np.uint8)
     
@@ -134,7 +68,7 @@ def update_image():
 
 
 def main():
-    global original_image, current_image, window_name, TRACKBARS_INITIALIZED
+    global original_image, worker, TRACKBARS_INITIALIZED
     
     parser = argparse.ArgumentParser(
         description="Interactive Seam Carving Tool"
@@ -142,6 +76,19 @@ def main():
     parser.add_argument(
         "input_image", type=str, help="Path to the input image"
     )
+    parser.add_argument(
+        "--energy",
+        type=str,
+        default=DEFAULT_ENERGY,
+        choices=sorted(ENERGY_FUNCTIONS),
+        help="Energy function used to rank pixels",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help="Keep the pre-computed seams here for the next run",
+    )
     args = parser.parse_args()
 
     input_image_path = find_image_path(args.input_image)
@@ -156,10 +103,14 @@ def main():
         print(f"Error: Unable to read image from {args.input_image}")
         sys.exit(1)
         
-    current_image = original_image.copy()
-    
     h, w = original_image.shape[:2]
 
+    # Every vertical and horizontal seam is found once, on a background
+    # thread that then serves the slider requests (latest one only).
+    # The horizontal seams of a narrowed image are found on request.
+    cache = SeamCache(args.cache_dir) if args.cache_dir else None
+    worker = ResizeWorker(original_image, args.energy, cache, show_progress)
+
     # Create a window
     cv2.namedWindow(window_name, cv2.WINDOW_AUTOSIZE)
 
@@ -172,32 +123,62 @@ def main():
     cv2.setTrackbarMin("Height", window_name, 1)
 
     print("--- Interactive Seam Carving ---")
-    print("Move the sliders to resize the image.")
-    print("The image will update when you release the slider.")
+    print("Move the sliders to resize the image instantly.")
+    print("(With both sizes reduced, the first height at a new width")
+    print(" carves its horizontal seams first: several seconds on a")
+    print(" 1428x968 image, progress in the window title. Use --cache_dir")
+    print(" to keep them for the next run.)")
+    print("(Sizes picked during the pre-compute are shown once it ends.)")
     print("Press 's' to save the current result.")
     print("Press 'q' or ESC to quit.")
 
     # Show the initial image
-    display_canvas = np.zeros((h, w, 3), dtype=np.uint8)
-    display_canvas[0:h, 0:w] = current_image
-    cv2.imshow(window_name, display_canvas)
+    show_frame(original_image)
 
     TRACKBARS_INITIALIZED = True
 
     last_w = w
     last_h = h
+    pre_computed = False
+    carving = False
     
     while True:
-        key = cv2.waitKey(50) & 0xFF
+        key = cv2.waitKey(30) & 0xFF
+
+        if worker.error is not None:
+            print(f"\nError: {worker.error}")
+            break
+
+        if not pre_computed and worker.ready:
+            pre_computed = True
+            print("\nPre-compute complete.")
+            cv2.setWindowTitle(window_name, window_name)
+        elif not pre_computed:
+            cv2.setWindowTitle(
+                window_name,
+                f"{window_name} - pre-computing {worker.progress:.0%}"
+            )
+        elif worker.carving:
+            carving = True
+            cv2.setWindowTitle(
+                window_name,
+                f"{window_name} - carving height {worker.progress:.0%}"
+            )
+        elif carving:
+            carving = False
+            cv2.setWindowTitle(window_name, window_name)
         
         current_w = cv2.getTrackbarPos("Width", window_name)
         current_h = cv2.getTrackbarPos("Height", window_name)
         
         if current_w != last_w or current_h != last_h:
-            print("Slider change detected, running update...")
             update_image()
             last_w = current_w
             last_h = current_h
+
+        # The last good frame stays up until the worker has a newer one
+        if worker.frame is not current_image:
+            show_frame(worker.frame)
         
         if key == ord('q') or key == 27: # 'q' or ESC
             break
@@ -217,6 +198,10 @@ def main():
             print(f"\nImage saved to {save_path}")
             # --- END OF MODIFIED BLOCK ---
 
+    try:
+        worker.close()
+    except Exception:
+        pass  # Already reported in the loop
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Seam Carving core package.
+
+Shared building blocks for the command line tools: energy functions,
+seam helpers, the dynamic programming search, the stateful SeamCarver
+engine, precomputed index maps for instant resizing and
+visualization/recording utilities.
+"""
+
+from .cache import SeamCache, image_digest
+from .dp import (
+    backtrack_seam,
+    cumulative_energy_map,
+    find_vertical_seam_dp,
+    update_cumulative_map,
+)
+from .energy import (
+    DEFAULT_ENERGY,
+    ENERGY_FUNCTIONS,
+    compute_energy,
+    get_energy_function,
+    register_energy,
+)
+from .engine import SeamCarver, SeamNotFoundError, carve
+from .protection import boxes_to_mask, detect_objects
+from .retarget import ResizeWorker, SeamIndexMaps, removal_rank_map
+from .saliency import spectral_residual_saliency
+from .seams import (
+    draw_seam,
+    remove_vertical_seam,
+    seam_keep_mask,
+    seam_order_map,
+    sequential_seams,
+)
+from .utils import find_image_path
+from .visualization import (
+    SeamHistory,
+    SeamRecorder,
+    load_seam_history,
+    render_seam_heatmap,
+    save_seam_history,
+)
+
+__all__ = [
+    'DEFAULT_ENERGY',
+    'ENERGY_FUNCTIONS',
+    'ResizeWorker',
+    'SeamCache',
+    'SeamCarver',
+    'SeamHistory',
+    'SeamIndexMaps',
+    'SeamNotFoundError',
+    'SeamRecorder',
+    'backtrack_seam',
+    'boxes_to_mask',
+    'carve',
+    'compute_energy',
+    'cumulative_energy_map',
+    'detect_objects',
+    'draw_seam',
+    'find_image_path',
+    'find_vertical_seam_dp',
+    'get_energy_function',
+    'image_digest',
+    'load_seam_history',
+    'register_energy',
+    'removal_rank_map',
+    'remove_vertical_seam',
+    'render_seam_heatmap',
+    'save_seam_history',
+    'seam_keep_mask',
+    'seam_order_map',
+    'sequential_seams',
+    'spectral_residual_saliency',
+    'update_cumulative_map',
+]
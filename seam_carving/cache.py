@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent, content-addressed cache of seam histories (and other small
+per-image results such as face detections).
+
+Entries are keyed by a hash of the decoded image pixels plus every
+parameter that influences which seams are found (seam finder, energy,
+direction, ...). Each entry is a compressed .npz holding the seam
+history in original coordinates; index maps for any prefix of the
+history are rebuilt from it with a single scatter (seam_order_map), so
+a cache hit costs only decode, gather and encode.
+
+The cache directory is bounded in size and evicts least recently used
+entries. Entries are written atomically and validated on load; corrupt
+or inconsistent entries are deleted and treated as a miss.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from .seams import seam_order_map
+
+DEFAULT_CACHE_SIZE_MB = 512
+
+ENTRY_SUFFIX = '.npz'
+
+
+def image_digest(image):
+    """SHA-256 of the decoded pixels (shape and dtype included)."""
+    digest = hashlib.sha256()
+    digest.update(f"{image.shape}|{image.dtype}".encode())
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+class SeamCache:
+    """
+    Size-bounded LRU cache of seam histories on disk.
+
+    Args:
+        directory: Cache folder (created if missing)
+        max_bytes: Total size above which old entries are evicted
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_SIZE_MB * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, image, params):
+        """
+        Cache key for an image and a dict of JSON-serializable
+        parameters.
+        """
+        payload = json.dumps(
+            {'image': image_digest(image), 'params': params},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def load_arrays(self, key):
+        """
+        Returns the dict of arrays stored under 'key', or None on a
+        miss or a corrupt entry.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+            if str(arrays.pop('key')) != key:
+                raise ValueError("entry does not match its key")
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            print(f"Warning: discarding corrupt cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        # Mark as recently used for LRU eviction
+        os.utime(path)
+        return arrays
+
+    def store_arrays(self, key, **arrays):
+        """Writes named arrays atomically, then enforces the size limit."""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.directory, suffix='.tmp' + ENTRY_SUFFIX
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, key=key, **arrays)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            self._remove(tmp_path)
+            raise
+
+        self.evict()
+
+    def load(self, key, shape):
+        """
+        Returns the cached (num_seams, height) seam history for 'key',
+        or None on a miss. 'shape' is the (height, width) of the image
+        in the carving orientation and is used to validate the entry.
+        """
+        arrays = self.load_arrays(key)
+        if arrays is None:
+            return None
+
+        try:
+            seams = arrays['seams']
+            if tuple(int(v) for v in arrays['shape']) != tuple(shape):
+                raise ValueError("entry was stored for another shape")
+            self._validate(seams, shape)
+        except (ValueError, KeyError) as e:
+            print(f"Warning: discarding invalid cache entry {key}: {e}")
+            self._remove(self._path(key))
+            return None
+
+        return seams
+
+    @staticmethod
+    def _validate(seams, shape):
+        height, width = shape
+        if seams.ndim != 2 or seams.shape[1] != height:
+            raise ValueError("bad seam history shape")
+        if seams.size and (seams.min() < 0 or seams.max() >= width):
+            raise ValueError("seam out of bounds")
+        # Every pixel may only be removed once
+        removed = np.count_nonzero(seam_order_map(seams, shape) >= 0)
+        if removed != seams.size:
+            raise ValueError("seams overlap")
+
+    def store(self, key, seams, shape):
+        """Stores a seam history (see load())."""
+        self.store_arrays(
+            key,
+            shape=np.asarray(shape, dtype=np.int64),
+            seams=np.asarray(seams, dtype=np.int32),
+        )
+
+    def evict(self):
+        """Deletes least recently used entries until under max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(ENTRY_SUFFIX) or '.tmp' in name:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""Command line front-end shared by the seam carving scripts"""
+
+import argparse
+import sys
+import time
+
+import cv2
+
+from .cache import DEFAULT_CACHE_SIZE_MB, SeamCache
+from .energy import DEFAULT_ENERGY, ENERGY_FUNCTIONS
+from .engine import SeamCarver
+from .protection import (
+    FACE_CASCADE,
+    PROTECTION_ENERGY,
+    boxes_to_mask,
+    detect_objects,
+)
+from .saliency import SALIENCY_ENERGY_SCALE, spectral_residual_saliency
+from .utils import find_image_path
+from .visualization import SeamRecorder, save_seam_history
+
+
+def build_parser(description):
+    """
+    Returns an ArgumentParser with the options common to all carvers.
+    Scripts add their own options before calling run().
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "input_image", type=str, help="Path to the input image"
+    )
+    parser.add_argument(
+        "output_image", type=str, help="Path to save the carved image"
+    )
+    parser.add_argument(
+        "--num_seams",
+        type=int,
+        default=50,
+        help="Number of seams to remove",
+    )
+    parser.add_argument(
+        "--direction",
+        type=str,
+        default="vertical",
+        choices=["vertical", "horizontal"],
+        help="Direction of seams to remove",
+    )
+    parser.add_argument(
+        "--energy",
+        type=str,
+        default=DEFAULT_ENERGY,
+        choices=sorted(ENERGY_FUNCTIONS),
+        help="Energy function used to rank pixels",
+    )
+    parser.add_argument(
+        "--saliency",
+        type=float,
+        default=0.0,
+        help="Weight of the spectral residual saliency term (0 = off)",
+    )
+    parser.add_argument(
+        "--protect_faces", "--protect-faces",
+        action="store_true",
+        help="Detect faces once and keep seams away from them",
+    )
+    parser.add_argument(
+        "--protect_cascade",
+        type=str,
+        default=FACE_CASCADE,
+        help="Haar cascade (bundled name or .xml path) for --protect_faces",
+    )
+    parser.add_argument(
+        "--visualize",
+        action="store_true",
+        help="Show each seam before removing it",
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        help="Record the seam removal to a video (.mp4, .avi or .gif)",
+    )
+    parser.add_argument(
+        "--record_every",
+        type=int,
+        default=1,
+        help="Only write a video frame for every n-th seam",
+    )
+    parser.add_argument(
+        "--save_seams",
+        type=str,
+        default=None,
+        help="Save the removed seams to a .npz (for image_comparison_viewer)",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help="Reuse seams from earlier runs on the same image and settings",
+    )
+    parser.add_argument(
+        "--cache_size_mb",
+        type=int,
+        default=DEFAULT_CACHE_SIZE_MB,
+        help="Maximum size of the seam cache before old entries are evicted",
+    )
+    return parser
+
+
+# Options that do not change which seams are found (excluded from keys)
+_NON_CACHE_OPTIONS = {
+    'input_image', 'output_image', 'num_seams', 'visualize', 'record',
+    'record_every', 'save_seams', 'cache_dir', 'cache_size_mb',
+}
+
+
+def cache_params(args, seam_finder, seams_per_pass=1):
+    """
+    Parameters that identify a carving job in the seam cache.
+
+    One seam at a time, the first k seams do not depend on num_seams, so
+    a cached history is a prefix that any run can replay and extend.
+    Seams found in passes do: the last pass is cut short by num_seams
+    and a batched finder picks its seams as a set, so num_seams is then
+    part of the key.
+    """
+    params = {
+        name: value for name, value in sorted(vars(args).items())
+        if name not in _NON_CACHE_OPTIONS
+    }
+    if seams_per_pass > 1:
+        params['num_seams'] = args.num_seams
+    if seam_finder is None:
+        params['seam_finder'] = 'dp'
+        return params
+
+    # functools.partial: identify the wrapped function and its options
+    # (state objects such as reusable graphs are not options)
+    keywords = getattr(seam_finder, 'keywords', None) or {}
+    options = {
+        name: value for name, value in keywords.items()
+        if value is None or isinstance(value, (str, int, float, bool))
+    }
+    if options:
+        params['seam_finder_options'] = dict(sorted(options.items()))
+    seam_finder = getattr(seam_finder, 'func', seam_finder)
+    params['seam_finder'] = (
+        f"{seam_finder.__module__}.{seam_finder.__qualname__}"
+    )
+    return params
+
+
+def load_image(input_arg):
+    """Finds and reads an input image, exiting with an error if needed."""
+    input_image_path = find_image_path(input_arg)
+
+    if input_image_path is None:
+        print(f"Error: Unable to find image file for '{input_arg}'")
+        sys.exit(1)
+
+    image = cv2.imread(input_image_path)
+
+    if image is None:
+        print(f"Error: Unable to read image from {input_arg}")
+        sys.exit(1)
+
+    return image
+
+
+def run(args, seam_finder=None, label=None, seams_per_pass=1):
+    """
+    Runs a carving job described by parsed 'args' with the given seam
+    finder (None = dynamic programming). 'seams_per_pass' > 1 removes
+    that many non-overlapping seams per energy map (custom finders).
+    """
+    image = load_image(args.input_image)
+
+    print(f"Original image size: {image.shape}")
+
+    recorder = None
+    if args.record:
+        try:
+            recorder = SeamRecorder(
+                args.record, image, args.direction, every=args.record_every
+            )
+        except (RuntimeError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    # record start time
+    start = time.time()
+
+    carver = SeamCarver(image, seam_finder, args.direction, args.energy)
+
+    if args.saliency > 0:
+        # Computed once; carried with the image instead of per seam
+        carver.add_energy_term(
+            spectral_residual_saliency(image),
+            args.saliency * SALIENCY_ENERGY_SCALE
+        )
+
+    cache = None
+    if args.cache_dir:
+        cache = SeamCache(args.cache_dir, args.cache_size_mb * 2**20)
+
+    if args.protect_faces:
+        try:
+            boxes = detect_objects(image, args.protect_cascade, cache=cache)
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Protecting {len(boxes)} detected region(s)")
+        carver.add_energy_term(
+            boxes_to_mask(image.shape, boxes), PROTECTION_ENERGY
+        )
+
+    cached_count = 0
+    stored_count = 0
+    if cache is not None:
+        key = cache.key(image,
+                        cache_params(args, seam_finder, seams_per_pass))
+        cached = cache.load(key, carver.original_shape)
+
+        # Seams replayed from the cache are not shown or recorded
+        if cached is not None:
+            stored_count = len(cached)
+            if not args.visualize and recorder is None:
+                cached_count = min(stored_count, args.num_seams)
+                carver.apply_seam_history(cached[:cached_count])
+                print(f"Cache hit: reusing {cached_count} seams")
+
+    carved_image = carver.carve(
+        args.num_seams - cached_count, args.visualize, recorder, label,
+        seams_per_pass
+    )
+
+    if cache is not None and len(carver.seams) > stored_count:
+        cache.store(key, carver.seam_history(), carver.original_shape)
+
+    print(f"Carved image size: {carved_image.shape}")
+
+    # record end time
+    end = time.time()
+    print(f"Time Taken: {end - start:.4f} seconds")
+
+    if recorder is not None:
+        recorder.close()
+        print(f"Recording saved to {args.record} "
+              f"({recorder.frames_written} frames)")
+
+    cv2.imwrite(args.output_image, carved_image)
+    print(f"Successfully saved carved image to {args.output_image}")
+
+    if args.save_seams:
+        save_seam_history(
+            args.save_seams, carver.seam_history(), args.direction,
+            image.shape
+        )
+        print(f"Seam history saved to {args.save_seams}")
+
+    return carved_image
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Dynamic programming seam search (full and incremental)"""
+
+import numpy as np
+
+
+def _min_of_parents(parents, out=None):
+    """
+    For every column j returns min(parents[j-1], parents[j], parents[j+1]),
+    ignoring neighbors that fall outside the row.
+    """
+    result = parents.copy() if out is None else out
+    if out is not None:
+        result[:] = parents
+    np.minimum(result[1:], parents[:-1], out=result[1:])
+    np.minimum(result[:-1], parents[1:], out=result[:-1])
+    return result
+
+
+def cumulative_energy_map(energy_map):
+    """
+    Computes the cumulative minimum energy map M, where M[i, j] is the
+    energy of the cheapest seam from the top row down to (i, j).
+    Each row is computed in one vectorized step.
+    """
+    height, width = energy_map.shape
+    M = energy_map.astype(np.float64, copy=True)
+    parents = np.empty(width, dtype=np.float64)
+
+    for i in range(1, height):
+        M[i] += _min_of_parents(M[i - 1], out=parents)
+
+    return M
+
+
+def backtrack_seam(M):
+    """
+    Recovers the lowest-energy vertical seam from a cumulative map.
+    Ties are broken towards the left, as in the original DP script.
+    """
+    height, width = M.shape
+    seam = np.zeros(height, dtype=np.uint32)
+    j = int(np.argmin(M[-1]))
+    seam[-1] = j
+
+    for i in range(height - 2, -1, -1):
+        start = max(j - 1, 0)
+        j = start + int(np.argmin(M[i, start:j + 2]))
+        seam[i] = j
+
+    return seam
+
+
+def find_vertical_seam_dp(energy_map):
+    """
+    Finds the lowest-energy vertical seam using dynamic programming.
+    """
+    return backtrack_seam(cumulative_energy_map(energy_map))
+
+
+def update_cumulative_map(M, energy_map, dirty_lo, dirty_hi):
+    """
+    Incrementally repairs a cumulative map after a seam removal.
+
+    'M' is the previous cumulative map with the seam already removed
+    (it is updated in place) and 'energy_map' the new energy map.
+    dirty_lo/dirty_hi give, per row, the inclusive column range whose
+    value may have changed because of the removal itself (changed
+    energy or changed parent relationship around the seam).
+
+    Changes only propagate downwards into a cone that grows by one
+    column per row, and rows stop propagating as soon as the
+    recomputed values equal the old ones, so the cost is proportional
+    to the size of the region that really changed.
+    """
+    height, width = M.shape
+    last = width - 1
+    dirty_lo = np.maximum(dirty_lo, 0).tolist()
+    dirty_hi = np.minimum(dirty_hi, last).tolist()
+    changed_lo, changed_hi = None, None
+
+    for i in range(height):
+        lo, hi = dirty_lo[i], dirty_hi[i]
+        if changed_lo is not None:
+            lo = min(lo, max(changed_lo - 1, 0))
+            hi = max(hi, min(changed_hi + 1, last))
+        if lo > hi:
+            changed_lo = None
+            continue
+
+        if i == 0:
+            new = energy_map[0, lo:hi + 1]
+        else:
+            # Parents of [lo, hi] are [lo - 1, hi + 1]; only the
+            # interior of the segment has all its neighbors
+            a, b = max(lo - 1, 0), min(hi + 2, width)
+            best = _min_of_parents(M[i - 1, a:b])
+            new = energy_map[i, lo:hi + 1] + best[lo - a:hi + 1 - a]
+
+        changed = (new != M[i, lo:hi + 1]).nonzero()[0]
+        if changed.size:
+            M[i, lo:hi + 1] = new
+            changed_lo, changed_hi = lo + changed[0], lo + changed[-1]
+        else:
+            changed_lo = None
+
+    return M
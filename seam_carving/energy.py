@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Energy functions for seam carving.
+
+Every registered energy function takes (image, gray): the BGR image and
+its grayscale plane. The SeamCarver engine converts to grayscale once
+per job and carves the gray plane along with the image, so energy
+functions never need to call cvtColor themselves.
+
+Each function also carries a 'radius' attribute: the number of
+neighboring pixels (in each direction) it reads. The engine uses it to
+patch the energy map around a removed seam instead of recomputing it
+for the whole image.
+"""
+
+import cv2
+import numpy as np
+
+# name -> energy function, filled by @register_energy
+ENERGY_FUNCTIONS = {}
+
+DEFAULT_ENERGY = 'sobel_l1'
+
+
+def register_energy(name, radius):
+    """
+    Decorator that adds an energy function to ENERGY_FUNCTIONS.
+    """
+    def decorator(function):
+        function.radius = radius
+        ENERGY_FUNCTIONS[name] = function
+        return function
+    return decorator
+
+
+def get_energy_function(name):
+    """Looks up a registered energy function by name."""
+    try:
+        return ENERGY_FUNCTIONS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown energy '{name}'. "
+            f"Choose from: {', '.join(sorted(ENERGY_FUNCTIONS))}"
+        )
+
+
+def to_gray(image):
+    """Grayscale plane used by the energy functions."""
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+@register_energy('sobel_l1', radius=1)
+def sobel_l1_energy(image, gray):
+    """
+    Sum of the absolute 3x3 Sobel gradients in x and y (the original
+    energy of all the scripts).
+    """
+    sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
+    sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+    return np.abs(sobel_x) + np.abs(sobel_y)
+
+
+@register_energy('sobel_l2', radius=1)
+def sobel_l2_energy(image, gray):
+    """Gradient magnitude of the 3x3 Sobel gradients."""
+    sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
+    sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+    return cv2.magnitude(sobel_x, sobel_y)
+
+
+@register_energy('scharr', radius=1)
+def scharr_energy(image, gray):
+    """
+    Sum of the absolute Scharr gradients (more rotation invariant than
+    the 3x3 Sobel).
+    """
+    scharr_x = cv2.Scharr(gray, cv2.CV_64F, 1, 0)
+    scharr_y = cv2.Scharr(gray, cv2.CV_64F, 0, 1)
+    return np.abs(scharr_x) + np.abs(scharr_y)
+
+
+@register_energy('laplacian', radius=1)
+def laplacian_energy(image, gray):
+    """Absolute response of the 3x3 Laplacian."""
+    return np.abs(cv2.Laplacian(gray, cv2.CV_64F, ksize=1))
+
+
+@register_energy('gradient', radius=1)
+def gradient_energy(image, gray):
+    """
+    Simple central differences without smoothing (the e1 energy of
+    Avidan & Shamir).
+    """
+    grad_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=1)
+    grad_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=1)
+    return np.abs(grad_x) + np.abs(grad_y)
+
+
+def _channel_gradients(image, ksize):
+    """
+    Per-channel |d/dx| + |d/dy| for all channels of an interleaved BGR
+    image in one Sobel call per direction.
+
+    Works in int16 (a 3x3 Sobel of uint8 data is at most 4 * 255 per
+    direction), which keeps the three-channel intermediates at the
+    size of a single float64 plane.
+    """
+    grad_x = cv2.Sobel(image, cv2.CV_16S, 1, 0, ksize=ksize)
+    grad_y = cv2.Sobel(image, cv2.CV_16S, 0, 1, ksize=ksize)
+    np.abs(grad_x, out=grad_x)
+    np.abs(grad_y, out=grad_y)
+    grad_x += grad_y
+    return grad_x
+
+
+@register_energy('color_gradient', radius=1)
+def color_gradient_energy(image, gray):
+    """
+    Central differences summed over the B, G and R channels, so edges
+    between colors of equal brightness are kept.
+    """
+    return _channel_gradients(image, ksize=1).sum(axis=2, dtype=np.float64)
+
+
+@register_energy('color_sobel_max', radius=1)
+def color_sobel_max_energy(image, gray):
+    """
+    Largest per-channel Sobel L1 gradient over B, G and R. Keeps chroma
+    edges (e.g. red on green of equal brightness) that the grayscale
+    conversion loses.
+    """
+    return _channel_gradients(image, ksize=3).max(axis=2).astype(np.float64)
+
+
+@register_energy('color_sobel_sum', radius=1)
+def color_sobel_sum_energy(image, gray):
+    """Per-channel Sobel L1 gradients summed over B, G and R."""
+    return _channel_gradients(image, ksize=3).sum(axis=2, dtype=np.float64)
+
+
+def window_sums(plane, half):
+    """
+    Sum of 'plane' over the (2 * half + 1)^2 window around every pixel
+    (clipped at the image border), read from an integral image with
+    four lookups per pixel, so the cost does not depend on the window
+    size. Also returns the number of pixels in each clipped window.
+
+    With integer input the sums are exact, so values computed on a
+    sub-window match the full image (needed for energy patching).
+    """
+    height, width = plane.shape
+    integral = cv2.integral(plane, sdepth=cv2.CV_64F)
+
+    r0 = np.clip(np.arange(height) - half, 0, height)
+    r1 = np.clip(np.arange(height) + half + 1, 0, height)
+    c0 = np.clip(np.arange(width) - half, 0, width)
+    c1 = np.clip(np.arange(width) + half + 1, 0, width)
+
+    sums = (integral[np.ix_(r1, c1)] - integral[np.ix_(r0, c1)]
+            - integral[np.ix_(r1, c0)] + integral[np.ix_(r0, c0)])
+    counts = np.outer(r1 - r0, c1 - c0)
+    return sums, counts
+
+
+# Local entropy (Avidan & Shamir): 9x9 window, gray levels in 16 bins
+ENTROPY_HALF_WINDOW = 4
+ENTROPY_BINS = 16
+
+
+@register_energy('entropy', radius=ENTROPY_HALF_WINDOW)
+def entropy_energy(image, gray):
+    """
+    Central-difference gradient plus the entropy of the gray levels in
+    a 9x9 window, scaled to 0..255. Favors seams through flat areas
+    over seams through busy texture.
+
+    Uses one integral image per gray level bin (an integral
+    histogram), so every pixel's window statistic costs O(1).
+    """
+    levels = gray // (256 // ENTROPY_BINS)
+    entropy = np.zeros(gray.shape, dtype=np.float64)
+
+    for level in range(ENTROPY_BINS):
+        in_bin = (levels == level).astype(np.uint8)
+        counts, totals = window_sums(in_bin, ENTROPY_HALF_WINDOW)
+        p = counts / totals
+        entropy -= p * np.log2(p, where=p > 0, out=np.zeros_like(p))
+
+    entropy *= 255.0 / np.log2(ENTROPY_BINS)
+    return gradient_energy(image, gray) + entropy
+
+
+# Histogram of oriented gradients (Avidan & Shamir): 11x11, 8 bins
+HOG_HALF_WINDOW = 5
+HOG_BINS = 8
+
+
+@register_energy('hog', radius=HOG_HALF_WINDOW + 1)
+def hog_energy(image, gray):
+    """
+    Central-difference gradient divided by the largest bin of the
+    histogram of oriented gradients in an 11x11 window. Strong, uniform
+    texture gets a low energy, isolated edges a high one. The result
+    is a ratio (well below 1 for most pixels), so additive terms such
+    as --saliency need much smaller weights with this energy.
+
+    Histogram votes are weighted by the integer L1 gradient magnitude,
+    and every orientation bin gets its own integral image, so the
+    window histograms cost O(1) per pixel and are exact.
+    """
+    grad_x = cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3)
+    grad_y = cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3)
+    magnitude = (np.abs(grad_x.astype(np.int32))
+                 + np.abs(grad_y.astype(np.int32))).astype(np.uint16)
+
+    # Unsigned orientation in [0, pi)
+    angle = cv2.phase(grad_x.astype(np.float32), grad_y.astype(np.float32))
+    orientation = np.mod(angle, np.pi)
+    bins = np.minimum((orientation * (HOG_BINS / np.pi)).astype(np.int32),
+                      HOG_BINS - 1)
+
+    largest = np.zeros(gray.shape, dtype=np.float64)
+    for b in range(HOG_BINS):
+        votes = np.where(bins == b, magnitude, 0).astype(np.uint16)
+        hist, _ = window_sums(votes, HOG_HALF_WINDOW)
+        np.maximum(largest, hist, out=largest)
+
+    return gradient_energy(image, gray) / np.maximum(largest, 1.0)
+
+
+def compute_energy(image, gray=None, energy=DEFAULT_ENERGY):
+    """
+    Calculates the energy map of an image with a registered energy
+    function (Sobel L1 by default). The grayscale plane is computed
+    if not given.
+    """
+    if gray is None:
+        gray = to_gray(image)
+    return get_energy_function(energy)(image, gray)
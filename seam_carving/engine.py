@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""Stateful seam carving engine shared by all command line tools"""
+
+import cv2
+import numpy as np
+
+from .dp import backtrack_seam, cumulative_energy_map, update_cumulative_map
+from .energy import DEFAULT_ENERGY, get_energy_function, to_gray
+from .seams import (
+    draw_seam,
+    remove_with_mask,
+    seam_keep_mask,
+    seam_order_map,
+    sequential_seams,
+)
+
+# Rows per block when patching the energy map around a removed seam.
+# Seams move at most one column per row, so a block only covers a
+# narrow column range.
+ENERGY_PATCH_BLOCK = 32
+
+
+class SeamNotFoundError(RuntimeError):
+    """
+    Raised by a seam finder that could not produce a valid seam. The
+    SeamCarver then falls back to its dynamic programming search.
+    """
+
+
+def _window_extent(values, radius):
+    """
+    Per-row minimum and maximum of 'values' over rows i-radius..i+radius.
+    """
+    padded = np.pad(values, radius, mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1)
+    return windows.min(axis=1), windows.max(axis=1)
+
+
+class SeamCarver:
+    """
+    Owns an image and all per-pixel state needed to carve it between
+    operations: the energy map, the DP cumulative map and an index map
+    of original coordinates. The grayscale plane is computed once and
+    carved along with the image, so energy functions never re-convert.
+    Precomputed per-pixel terms (saliency, protection masks, ...) are
+    carried the same way and added to the energy (add_energy_term).
+
+    All work is done in the carving orientation: for horizontal seams
+    the image is transposed once up front and back in result().
+
+    Args:
+        image: BGR image (height, width, 3)
+        seam_finder: callable(energy_map) -> seam, or
+            callable(energy_map, gray) if it has a true 'needs_gray'
+            attribute. A finder with a true 'batched' attribute also
+            takes the number of seams wanted as keyword 'count' and
+            returns that many non-overlapping seams as a
+            (num_seams, height) array. It may raise SeamNotFoundError,
+            in which case one seam is found by dynamic programming
+            instead. None uses the built-in dynamic programming search,
+            whose cumulative map is repaired incrementally after every
+            seam.
+        direction: 'vertical' or 'horizontal'
+        energy_function: name from ENERGY_FUNCTIONS or a
+            callable(image, gray) -> energy map. An optional 'radius'
+            attribute (pixels read around each output pixel) enables
+            patching the energy map around removed seams.
+    """
+
+    def __init__(self, image, seam_finder=None, direction='vertical',
+                 energy_function=DEFAULT_ENERGY):
+        self.direction = direction
+        self.seam_finder = seam_finder
+        if isinstance(energy_function, str):
+            energy_function = get_energy_function(energy_function)
+        self.energy_function = energy_function
+
+        if direction == 'horizontal':
+            image = image.transpose(1, 0, 2)
+        self.image = np.ascontiguousarray(image)
+        self.gray = to_gray(self.image)
+
+        height, width = self.image.shape[:2]
+        self.original_shape = (height, width)
+        self.index_map = np.tile(np.arange(width, dtype=np.int32), (height, 1))
+        self.energy_map = None
+        self.cumulative_map = None
+        self.seams = []
+
+        # [plane, weight] pairs added to the energy, carved with the image
+        self.energy_terms = []
+
+    @property
+    def shape(self):
+        """Current (height, width) in the carving orientation."""
+        return self.image.shape[:2]
+
+    def add_energy_term(self, plane, weight=1.0):
+        """
+        Adds weight * plane to the energy of every pixel.
+
+        'plane' is a (height, width) map of the original image in its
+        original orientation, computed once (e.g. saliency). It is
+        carried through carving like the image; pixels already removed
+        are dropped using the index map.
+        """
+        if self.direction == 'horizontal':
+            plane = plane.T
+        rows = np.arange(self.shape[0])[:, None]
+        plane = np.ascontiguousarray(plane[rows, self.index_map])
+        self.energy_terms.append([plane, weight])
+
+        self.energy_map = None
+        self.cumulative_map = None
+
+    def _evaluate_energy(self, rows, cols):
+        """Energy of the window image[rows, cols] including all terms."""
+        energy = self.energy_function(self.image[rows, cols],
+                                      self.gray[rows, cols])
+        for plane, weight in self.energy_terms:
+            energy = energy + weight * plane[rows, cols]
+        return energy
+
+    def compute_energy_map(self):
+        """Returns the energy map, computing it on first use."""
+        if self.energy_map is None:
+            everything = slice(None)
+            self.energy_map = self._evaluate_energy(everything, everything)
+        return self.energy_map
+
+    def find_seam(self):
+        """Finds the next seam in current coordinates."""
+        energy_map = self.compute_energy_map()
+
+        if self.seam_finder is not None:
+            return self._run_seam_finder(energy_map)[0]
+
+        if self.cumulative_map is None:
+            self.cumulative_map = cumulative_energy_map(energy_map)
+        return backtrack_seam(self.cumulative_map)
+
+    def _run_seam_finder(self, energy_map, count=1):
+        """
+        Runs the custom seam finder and returns its seams as a
+        (num_seams, height) array: one seam unless it is batched.
+        """
+        args = [energy_map]
+        if getattr(self.seam_finder, 'needs_gray', False):
+            args.append(self.gray)
+        kwargs = {}
+        if getattr(self.seam_finder, 'batched', False):
+            kwargs['count'] = count
+        try:
+            seams = self.seam_finder(*args, **kwargs)
+        except SeamNotFoundError as e:
+            print(f"\nWarning: {e}; retrying with dynamic programming")
+            seams = backtrack_seam(cumulative_energy_map(energy_map))
+        return np.asarray(seams, dtype=np.intp).reshape(-1, self.shape[0])
+
+    def find_seams(self, count):
+        """
+        Finds up to 'count' non-overlapping seams on one energy map, as
+        a (num_seams, height) array in current coordinates.
+
+        The seam finder runs repeatedly on a copy of the energy map in
+        which the pixels of the seams found so far are infinite. A seam
+        that can only be completed through such a pixel is rejected and
+        its start pixel excluded; the batch ends after 'count' rejected
+        seams. A batched seam finder is asked for all of them at once.
+        The built-in DP search always finds a single seam.
+        """
+        if count <= 1 or self.seam_finder is None:
+            return np.asarray(self.find_seam(), dtype=np.intp)[None]
+        if getattr(self.seam_finder, 'batched', False):
+            return self._run_seam_finder(self.compute_energy_map(), count)
+
+        masked = self.compute_energy_map().astype(np.float64)
+        rows = np.arange(self.shape[0])
+        count = min(count, self.shape[1])
+        seams = []
+        rejected = 0
+        while len(seams) < count and rejected < count:
+            seam = self._run_seam_finder(masked)[0]
+            if np.isinf(masked[rows, seam]).any():
+                if not seams:
+                    return seam[None]  # Infinite energy in the map itself
+                masked[0, seam[0]] = np.inf
+                rejected += 1
+                continue
+            masked[rows, seam] = np.inf
+            seams.append(seam)
+        return np.array(seams, dtype=np.intp)
+
+    def remove_seam(self, seam):
+        """
+        Removes a seam (current coordinates) from the image and every
+        carried plane, and records it in original coordinates.
+        """
+        seam = np.asarray(seam, dtype=np.intp)
+        rows = np.arange(len(seam))
+        keep = seam_keep_mask(self.shape, seam)
+
+        self.seams.append(self.index_map[rows, seam])
+        self.index_map = remove_with_mask(self.index_map, keep)
+        self.image = remove_with_mask(self.image, keep)
+        self.gray = remove_with_mask(self.gray, keep)
+        for term in self.energy_terms:
+            term[0] = remove_with_mask(term[0], keep)
+
+        radius = getattr(self.energy_function, 'radius', None)
+        if self.energy_map is not None and radius is None:
+            # Unknown footprint: recompute from scratch on next use
+            self.energy_map = None
+            self.cumulative_map = None
+        elif self.energy_map is not None:
+            self.energy_map = remove_with_mask(self.energy_map, keep)
+            self._patch_energy(seam, radius)
+
+            if self.cumulative_map is not None:
+                self.cumulative_map = remove_with_mask(
+                    self.cumulative_map, keep
+                )
+                # Columns whose energy or DP parents may have changed
+                q = max(radius, 1)
+                seam_lo, seam_hi = _window_extent(seam, q)
+                update_cumulative_map(
+                    self.cumulative_map, self.energy_map,
+                    seam_lo - q - 2, seam_hi + q + 1
+                )
+
+    def apply_seam_history(self, seams):
+        """
+        Removes many seams given in original coordinates (e.g. from a
+        cache or a previous run) in a single compaction.
+
+        The seams must still be present in the current image. Derived
+        maps are dropped and recomputed on next use.
+        """
+        seams = np.asarray(seams, dtype=np.int32).reshape(-1, self.shape[0])
+        if len(seams) == 0:
+            return
+
+        order = seam_order_map(seams, self.original_shape)
+        rows = np.arange(self.shape[0])[:, None]
+        self._compact(order[rows, self.index_map] < 0, len(seams))
+        self.seams.extend(seams)
+
+    def remove_seams(self, seams):
+        """
+        Removes non-overlapping seams found on the current image
+        (current coordinates, e.g. from find_seams()) in a single
+        compaction. Derived maps are recomputed on next use.
+        """
+        seams = np.asarray(seams, dtype=np.intp).reshape(-1, self.shape[0])
+        if len(seams) == 0:
+            return
+        if len(seams) == 1:
+            self.remove_seam(seams[0])
+            return
+
+        rows = np.arange(self.shape[0])
+        self.seams.extend(self.index_map[rows, seams])
+        self._compact(seam_order_map(seams, self.shape) < 0, len(seams))
+
+    def _compact(self, keep, count):
+        """
+        Removes 'count' pixels per row (False in 'keep') from the image
+        and every carried plane, and drops the derived maps.
+        """
+        self.index_map = remove_with_mask(self.index_map, keep, count)
+        self.image = remove_with_mask(self.image, keep, count)
+        self.gray = remove_with_mask(self.gray, keep, count)
+        for term in self.energy_terms:
+            term[0] = remove_with_mask(term[0], keep, count)
+        self.energy_map = None
+        self.cumulative_map = None
+
+    def _patch_energy(self, seam, radius):
+        """
+        Recomputes the energy map only around a removed seam.
+
+        The image is processed in blocks of rows; for each block the
+        energy function runs on a small window covering the seam's
+        column range plus a margin, and only the interior that can
+        have changed is copied back.
+        """
+        height, width = self.shape
+        if width == 0:
+            return
+
+        seam_lo, seam_hi = _window_extent(seam, radius)
+
+        for r0 in range(0, height, ENERGY_PATCH_BLOCK):
+            r1 = min(r0 + ENERGY_PATCH_BLOCK, height)
+
+            # Columns (new coordinates) that can have changed
+            c0 = max(int(seam_lo[r0:r1].min()) - radius - 1, 0)
+            c1 = min(int(seam_hi[r0:r1].max()) + radius + 1, width)
+
+            # Window with enough margin for the energy function
+            wr0, wr1 = max(r0 - radius, 0), min(r1 + radius, height)
+            wc0, wc1 = max(c0 - radius, 0), min(c1 + radius, width)
+
+            patch = self._evaluate_energy(
+                slice(wr0, wr1), slice(wc0, wc1)
+            )
+            self.energy_map[r0:r1, c0:c1] = \
+                patch[r0 - wr0:r1 - wr0, c0 - wc0:c1 - wc0]
+
+    def carve(self, num_seams, visualize=False, recorder=None, label=None,
+              seams_per_pass=1):
+        """
+        Repeatedly finds and removes seams.
+        'visualize=True' will show each seam before removal.
+        'recorder' (a SeamRecorder) receives every seam for a
+        non-blocking video of the process.
+        'seams_per_pass' > 1 takes up to that many non-overlapping seams
+        from each energy map (see find_seams()) and removes them in a
+        single compaction.
+        """
+        suffix = f" ({label})" if label else ""
+
+        removed = 0
+        while removed < num_seams:
+            seams = self.find_seams(min(seams_per_pass, num_seams - removed))
+
+            if visualize:
+                viz_img = self.image
+                for seam in seams:
+                    viz_img = draw_seam(viz_img, seam, 'vertical')
+                if self.direction == 'horizontal':
+                    viz_img = viz_img.transpose(1, 0, 2)
+
+                print(f"Showing seam {removed + len(seams)}/{num_seams}. "
+                      "Press any key to continue...")
+                cv2.imshow("Seam Visualization (press any key)", viz_img)
+                cv2.waitKey(0)  # Wait for a key press
+
+            if recorder is not None:
+                for seam in sequential_seams(seams):
+                    recorder.add_seam(seam)
+
+            self.remove_seams(seams)
+            removed += len(seams)
+
+            # Print progress (use end='\r' to stay on one line)
+            print(f"Removed seam {removed}/{num_seams}{suffix}", end='\r')
+
+        print("\nDone.")  # Newline after loop
+
+        # Clean up any open windows
+        if visualize:
+            cv2.destroyAllWindows()
+
+        return self.result()
+
+    def result(self):
+        """Returns the carved image in the original orientation."""
+        if self.direction == 'horizontal':
+            return np.ascontiguousarray(self.image.transpose(1, 0, 2))
+        return self.image.copy()
+
+    def seam_history(self):
+        """
+        Returns all removed seams in original coordinates as a
+        (num_seams, length) int32 array (carving orientation).
+        """
+        length = self.index_map.shape[0]
+        return np.array(self.seams, dtype=np.int32).reshape(-1, length)
+
+
+def carve(image, num_seams, direction, seam_finder=None, visualize=False,
+          recorder=None, label=None, energy_function=DEFAULT_ENERGY,
+          seams_per_pass=1):
+    """
+    Convenience wrapper: carves 'num_seams' seams and returns the image.
+    """
+    carver = SeamCarver(image, seam_finder, direction, energy_function)
+    return carver.carve(num_seams, visualize, recorder, label, seams_per_pass)
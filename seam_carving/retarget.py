@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+Precomputed seam index maps for instant resizing.
+
+All seams of one direction are removed once, up front, and the order in
+which the pixels went is kept as a rank map. Removing the first k seams
+is then a single vectorized gather of the pixels ranked k or higher,
+for any k. The vertical and horizontal maps are both computed on the
+original image, so they serve width-only and height-only resizes.
+When both sizes change, the width is carved first, as before: the
+horizontal seams of the narrowed image are found one at a time on
+request (about 25 ms a seam at 1000 x 968, so seconds for the first
+height at a new width) and kept per width, in memory and in the
+SeamCache when given, so later heights at that width, in this run or
+the next, are gathers again.
+
+ResizeWorker runs both the precompute and the resizes on a background
+thread for interactive use, always serving the latest request only.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from .energy import DEFAULT_ENERGY
+from .engine import SeamCarver
+from .seams import remove_with_mask, seam_order_map
+
+
+def removal_rank_map(image, direction='vertical', energy=DEFAULT_ENERGY,
+                     progress=None, cache=None):
+    """
+    Removes all but one seam of 'direction' with the DP engine and
+    returns a (height, width) int32 map of the order in which pixels
+    were removed (original orientation). Pixels that are never removed
+    get the number of seams.
+
+    'progress' is called as progress(done, total) after every seam.
+    With 'cache' (a SeamCache) the seam history is reused across runs.
+    """
+    carver = SeamCarver(image, direction=direction, energy_function=energy)
+    total = carver.shape[1] - 1
+
+    key = None
+    seams = None
+    if cache is not None:
+        key = cache.key(image, {
+            'rank_map': direction, 'energy': energy, 'seam_finder': 'dp'
+        })
+        seams = cache.load(key, carver.original_shape)
+        if seams is not None and len(seams) != total:
+            seams = None
+
+    if seams is None:
+        for done in range(1, total + 1):
+            carver.remove_seam(carver.find_seam())
+            if progress is not None:
+                progress(done, total)
+        seams = carver.seam_history()
+        if cache is not None:
+            cache.store(key, seams, carver.original_shape)
+    elif progress is not None:
+        progress(total, total)
+
+    ranks = seam_order_map(seams, carver.original_shape)
+    ranks[ranks < 0] = total
+    if direction == 'horizontal':
+        ranks = ranks.T
+    return np.ascontiguousarray(ranks)
+
+
+def _remove_rows(image, ranks, removed):
+    """
+    Removes the 'removed' lowest ranked pixels of every column of
+    'image', given a horizontal rank map in carving orientation
+    ((width, height), as in seam_order_map()).
+    """
+    rows_first = np.ascontiguousarray(image.transpose(1, 0, 2))
+    carved = remove_with_mask(rows_first, ranks >= removed, removed)
+    return np.ascontiguousarray(carved.transpose(1, 0, 2))
+
+
+# Narrowed widths whose horizontal seams are kept by SeamIndexMaps
+NARROWED_WIDTHS_KEPT = 4
+
+
+class SeamIndexMaps:
+    """
+    Vertical and horizontal removal rank maps of an image (see
+    removal_rank_map()), computed once; resize() then serves any width
+    or any height with gathers, in milliseconds. Changing both carves
+    the missing horizontal seams of the narrowed image first (see the
+    module docstring).
+
+    Args:
+        image: BGR image (height, width, 3)
+        energy: Name from ENERGY_FUNCTIONS
+        progress: Optional callable(done, total) over both directions
+        cache: Optional SeamCache to reuse the seams across runs
+    """
+
+    def __init__(self, image, energy=DEFAULT_ENERGY, progress=None,
+                 cache=None):
+        self.image = image
+        self.energy = energy
+        self.cache = cache
+        height, width = image.shape[:2]
+        total = (width - 1) + (height - 1)
+
+        # width -> [horizontal SeamCarver of the image at that width,
+        # number of its seams in the cache], least recently used first
+        self._narrowed = OrderedDict()
+
+        def report(offset):
+            if progress is None:
+                return None
+            return lambda done, _: progress(offset + done, total)
+
+        self.vertical = removal_rank_map(
+            image, 'vertical', energy, report(0), cache
+        )
+        self.horizontal = removal_rank_map(
+            image, 'horizontal', energy, report(width - 1), cache
+        )
+
+    def _narrowed_key(self, image):
+        return self.cache.key(image, {
+            'narrowed_rank_map': 'horizontal', 'energy': self.energy,
+            'seam_finder': 'dp'
+        })
+
+    def _narrowed_carver(self, image):
+        """
+        [horizontal SeamCarver, cached seam count] kept for the width
+        of 'image', resumed from the cache when it has seams for it.
+        """
+        width = image.shape[1]
+        entry = self._narrowed.pop(width, None)
+        if entry is None:
+            carver = SeamCarver(image, direction='horizontal',
+                                energy_function=self.energy)
+            stored = 0
+            if self.cache is not None:
+                seams = self.cache.load(self._narrowed_key(image),
+                                        carver.original_shape)
+                if seams is not None:
+                    carver.apply_seam_history(seams)
+                    stored = len(seams)
+            entry = [carver, stored]
+        self._narrowed[width] = entry
+        while len(self._narrowed) > NARROWED_WIDTHS_KEPT:
+            self._narrowed.popitem(last=False)
+        return entry
+
+    def _store_narrowed(self, image, entry):
+        """Writes the seams of a narrowed width to the cache if new."""
+        carver, stored = entry
+        if self.cache is not None and len(carver.seams) > stored:
+            self.cache.store(self._narrowed_key(image),
+                             carver.seam_history(), carver.original_shape)
+            entry[1] = len(carver.seams)
+
+    def resize(self, width, height, cancelled=None, progress=None):
+        """
+        Returns the image carved down to 'width' x 'height' (each at
+        least 1 and at most the original size), the same as removing
+        the vertical seams and then the horizontal ones one at a time.
+
+        Width-only and height-only sizes take milliseconds. Otherwise
+        the horizontal seams of the narrowed image not yet found are
+        carved first, with progress(done, total) called after each.
+
+        'cancelled' is an optional callable checked after the width
+        gather and between horizontal seams; if it returns True, None
+        is returned instead. Seams found until then are kept.
+        """
+        image = self.image
+        original_height, original_width = image.shape[:2]
+
+        removed = original_width - width
+        if removed > 0:
+            keep = self.vertical >= removed
+            image = remove_with_mask(image, keep, removed)
+
+        removed = original_height - height
+        if removed <= 0:
+            return image
+        if cancelled is not None and cancelled():
+            return None
+        if width == original_width:
+            return _remove_rows(image, self.horizontal.T, removed)
+
+        entry = self._narrowed_carver(image)
+        carver = entry[0]
+        try:
+            while len(carver.seams) < removed:
+                if cancelled is not None and cancelled():
+                    return None
+                carver.remove_seam(carver.find_seam())
+                if progress is not None:
+                    progress(len(carver.seams), removed)
+        finally:
+            self._store_narrowed(image, entry)
+
+        ranks = seam_order_map(carver.seam_history(), carver.original_shape)
+        ranks[ranks < 0] = len(carver.seams)
+        return _remove_rows(image, ranks, removed)
+
+
+# Seconds a resize request must stay the latest before work starts
+RESIZE_DEBOUNCE = 0.03
+
+
+class _Closed(Exception):
+    """Stops the worker thread's precompute when the worker is closed."""
+
+
+class ResizeWorker:
+    """
+    Builds the SeamIndexMaps of an image and serves resize requests on a
+    background thread, so a UI loop never blocks.
+
+    Requests are not queued: a new request replaces a pending one, work
+    only starts once a request has been the latest for 'debounce'
+    seconds, and a resize in flight is abandoned as soon as a newer
+    request arrives or the worker is closed, so close() returns within
+    a seam. 'frame' always holds the last finished result
+    (the original image until the first one). 'progress' is the
+    fraction of the precompute done, then, while 'carving' is True, of
+    the horizontal seams a resize to a new width still has to find.
+
+    Args:
+        image: BGR image (height, width, 3)
+        energy: Name from ENERGY_FUNCTIONS
+        cache: Optional SeamCache to reuse the seams across runs
+        progress: Optional callable(done, total), called on the worker
+            thread during the precompute
+        debounce: See above, in seconds
+    """
+
+    def __init__(self, image, energy=DEFAULT_ENERGY, cache=None,
+                 progress=None, debounce=RESIZE_DEBOUNCE):
+        self.image = image
+        self.energy = energy
+        self.cache = cache
+        self.debounce = debounce
+        self.on_progress = progress
+
+        self.frame = image
+        self.progress = 0.0
+        self.ready = False
+        self.carving = False
+        self.error = None
+
+        self._condition = threading.Condition()
+        self._request = None
+        self._generation = 0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def request(self, width, height):
+        """Asks for the image at 'width' x 'height'. Never blocks."""
+        with self._condition:
+            self._request = (width, height)
+            self._generation += 1
+            self._condition.notify()
+
+    def close(self):
+        """Stops the worker thread and re-raises any error it hit."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _report(self, done, total):
+        if self._closed:
+            raise _Closed()
+        self.progress = done / max(total, 1)
+        if self.on_progress is not None:
+            self.on_progress(done, total)
+
+    def _report_carving(self, done, total):
+        self.carving = True
+        self.progress = done / max(total, 1)
+
+    def _run(self):
+        try:
+            index_maps = SeamIndexMaps(self.image, self.energy, self._report,
+                                       self.cache)
+        except _Closed:
+            return
+        except Exception as e:
+            self.error = e
+            return
+        self.ready = True
+
+        while True:
+            with self._condition:
+                while self._request is None and not self._closed:
+                    self._condition.wait()
+                # Let the slider settle: restart the wait on every change
+                generation = None
+                while not self._closed and generation != self._generation:
+                    generation = self._generation
+                    deadline = time.monotonic() + self.debounce
+                    while (not self._closed
+                           and generation == self._generation
+                           and time.monotonic() < deadline):
+                        self._condition.wait(deadline - time.monotonic())
+                if self._closed:
+                    return
+                size, self._request = self._request, None
+
+            try:
+                frame = index_maps.resize(
+                    *size,
+                    cancelled=lambda: (self._closed
+                                       or generation != self._generation),
+                    progress=self._report_carving
+                )
+            except Exception as e:
+                self.error = e
+                return
+            finally:
+                self.carving = False
+            if self._closed:
+                return
+            if frame is not None and generation == self._generation:
+                self.frame = frame
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Seam helpers shared by all seam carving engines"""
+
+import numpy as np
+
+
+def seam_keep_mask(shape, seam):
+    """
+    Returns a boolean (height, width) mask that is False exactly on
+    the pixels of a vertical seam.
+    """
+    height, width = shape[:2]
+    keep = np.ones((height, width), dtype=bool)
+    keep[np.arange(height), seam] = False
+    return keep
+
+
+def seam_order_map(seams, shape):
+    """
+    Returns a (height, width) int32 map holding, for every pixel, the
+    index of the seam that removed it, or -1 for kept pixels.
+
+    'seams' is a (num_seams, height) array in original coordinates.
+    All seams are written with a single vectorized scatter.
+    """
+    height, width = shape[:2]
+    seams = np.asarray(seams, dtype=np.intp).reshape(-1, height)
+    order = np.full((height, width), -1, dtype=np.int32)
+    rows = np.broadcast_to(np.arange(height), seams.shape)
+    seam_ids = np.broadcast_to(
+        np.arange(seams.shape[0], dtype=np.int32)[:, None], seams.shape
+    )
+    order[rows, seams] = seam_ids
+    return order
+
+
+def sequential_seams(seams):
+    """
+    Converts non-overlapping seams that were all found on the same
+    image (a (num_seams, height) array) into the coordinates each seam
+    has once the seams before it are removed, i.e. the form produced by
+    finding and removing them one at a time.
+    """
+    seams = np.asarray(seams, dtype=np.intp)
+    sequential = seams.copy()
+    for j in range(1, len(seams)):
+        sequential[j] -= np.count_nonzero(seams[:j] < seams[j], axis=0)
+    return sequential
+
+
+def remove_with_mask(array, keep, count=1):
+    """
+    Removes 'count' pixels per row from 'array' (2-D or 3-D) given a
+    keep mask (e.g. from seam_keep_mask()). The mask can be reused for
+    every plane carved with the same seam(s).
+    """
+    height, width = keep.shape
+    new_width = width - count
+    if array.ndim == 3:
+        # View each multi-channel pixel as a single opaque item so the
+        # mask selects whole pixels (much faster than per-channel)
+        array = np.ascontiguousarray(array)
+        pixel = np.dtype((np.void, array.shape[2] * array.itemsize))
+        pixels = array.view(pixel).reshape(height, width)
+        return pixels[keep].view(array.dtype).reshape(
+            height, new_width, array.shape[2]
+        )
+    return array[keep].reshape(height, new_width)
+
+
+def remove_vertical_seam(image, seam):
+    """
+    Removes a given vertical seam from an image (or any 2-D plane).
+    """
+    return remove_with_mask(image, seam_keep_mask(image.shape, seam))
+
+
+def draw_seam(image, seam, direction):
+    """
+    Draws a seam (vertical or horizontal) on a copy of the image.
+    """
+    display_image = image.copy()
+    positions = np.arange(len(seam))
+    if direction == 'vertical':
+        # Red pixels at (row, col)
+        display_image[positions, seam] = [0, 0, 255]  # BGR for red
+    else:  # horizontal
+        # Red pixels at (col, row)
+        display_image[seam, positions] = [0, 0, 255]  # BGR for red
+    return display_image
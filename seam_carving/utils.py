@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Small helpers shared by the command line tools"""
+
+import os
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png']
+
+
+def find_image_path(input_path):
+    """
+    Finds a valid image path.
+    If 'input_path' is not found, it tries appending
+    .jpg, .jpeg, and .png.
+    """
+    if os.path.exists(input_path):
+        return input_path
+
+    # Check for other extensions
+    for ext in IMAGE_EXTENSIONS:
+        path_with_ext = input_path + ext
+        if os.path.exists(path_with_ext):
+            print(f"Input '{input_path}' not found, using '{path_with_ext}'")
+            return path_with_ext
+
+    # Check if user already included extension but file is missing
+    base, ext = os.path.splitext(input_path)
+    if ext in IMAGE_EXTENSIONS:
+        if os.path.exists(base):
+            print(f"Input '{input_path}' not found, using '{base}'")
+            return base
+
+    return None
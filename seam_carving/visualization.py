@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Seam Visualization - seam history tracking and non-blocking recording
+of the carving process to a video (MP4/AVI) or an animated GIF.
+"""
+
+import os
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+from .seams import remove_with_mask, seam_keep_mask, seam_order_map
+
+
+class SeamHistory:
+    """
+    Maps seams found on a shrinking image back to the coordinates of
+    the original image.
+
+    An index map (the original column of every remaining pixel) is
+    carved alongside the image, so seam k can be looked up in original
+    coordinates even though the image it was found on had k fewer
+    columns. Everything is kept in the carving orientation, i.e. for
+    horizontal carving the shape is (width, height) of the image.
+    """
+
+    def __init__(self, height, width):
+        self.index_map = np.tile(np.arange(width, dtype=np.int32), (height, 1))
+        self.rows = np.arange(height)
+        self.seams = []
+
+    def add_seam(self, seam):
+        """
+        Records a seam given in current coordinates and returns its
+        columns in original coordinates.
+        """
+        original_cols = self.index_map[self.rows, seam]
+        self.seams.append(original_cols)
+
+        keep = seam_keep_mask(self.index_map.shape, seam)
+        self.index_map = remove_with_mask(self.index_map, keep)
+
+        return original_cols
+
+    def as_array(self):
+        """Returns the history as a (num_seams, height) int32 array."""
+        height = self.index_map.shape[0]
+        return np.array(self.seams, dtype=np.int32).reshape(-1, height)
+
+
+def save_seam_history(path, seams, direction, image_shape):
+    """
+    Saves a seam history (original coordinates) to a compressed .npz.
+    """
+    np.savez_compressed(
+        path,
+        seams=np.asarray(seams, dtype=np.int32),
+        direction=direction,
+        image_shape=np.asarray(image_shape[:2], dtype=np.int32),
+    )
+
+
+def load_seam_history(path):
+    """
+    Loads a seam history saved by save_seam_history().
+    Returns (seams, direction, (height, width)).
+    """
+    with np.load(path) as data:
+        seams = data['seams']
+        direction = str(data['direction'])
+        height, width = data['image_shape']
+    return seams, direction, (int(height), int(width))
+
+
+class SeamRecorder:
+    """
+    Streams the carving process to a video file on a background thread.
+
+    The carving loop only hands over each seam (a small 1-D array);
+    translating it to original coordinates, drawing the overlay and
+    encoding the frame all happen on the recorder thread, so carving
+    throughput is almost unaffected.
+
+    Every frame shows the original image with all previously removed
+    pixels darkened and the current seam in red. With 'every' > 1 only
+    every n-th seam produces a frame. A final frame with all removed
+    pixels darkened is always written on close().
+    """
+
+    def __init__(self, path, image, direction='vertical', every=1, fps=30):
+        if every < 1:
+            raise ValueError("'every' must be at least 1")
+
+        self.path = path
+        self.direction = direction
+        self.every = every
+        self.fps = fps
+
+        # Work in the carving orientation, like carve() does
+        if direction == 'horizontal':
+            image = image.transpose(1, 0, 2)
+        self.canvas = np.ascontiguousarray(image)
+        self.history = SeamHistory(*self.canvas.shape[:2])
+
+        self.writer = None
+        self.gif_frames = None
+        self.frames_written = 0
+        self.seams_seen = 0
+        self.error = None
+
+        self._open_writer()
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _open_writer(self):
+        h, w = self.canvas.shape[:2]
+        if self.direction == 'horizontal':
+            h, w = w, h
+
+        ext = os.path.splitext(self.path)[1].lower()
+        if ext == '.gif':
+            try:
+                from PIL import Image  # noqa: F401
+            except ImportError:
+                raise RuntimeError(
+                    "Recording to .gif requires Pillow (pip install pillow)"
+                )
+            self.gif_frames = []
+            return
+
+        fourcc = 'MJPG' if ext == '.avi' else 'mp4v'
+        self.writer = cv2.VideoWriter(
+            self.path, cv2.VideoWriter_fourcc(*fourcc), self.fps, (w, h)
+        )
+        if not self.writer.isOpened():
+            raise RuntimeError(f"Unable to open video writer for {self.path}")
+
+    def add_seam(self, seam):
+        """
+        Queues a seam (in current, carving-orientation coordinates).
+        Never blocks the caller.
+        """
+        self._queue.put(np.array(seam, copy=True))
+
+    def close(self):
+        """
+        Waits for all queued seams to be rendered and finalizes the file.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+        if self.error is None:
+            self._write_frame(self.canvas)
+
+        if self.writer is not None:
+            self.writer.release()
+        elif self.gif_frames:
+            from PIL import Image
+            frames = [Image.fromarray(f) for f in self.gif_frames]
+            frames[0].save(
+                self.path, save_all=True, append_images=frames[1:],
+                duration=int(1000 / self.fps), loop=0
+            )
+
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _run(self):
+        while True:
+            seam = self._queue.get()
+            if seam is None:
+                return
+            if self.error is not None:
+                continue  # Drain the queue, close() will re-raise
+            try:
+                self._render_seam(seam)
+            except Exception as e:
+                self.error = e
+
+    def _render_seam(self, seam):
+        rows = self.history.rows
+        cols = self.history.add_seam(seam)
+        self.seams_seen += 1
+
+        if self.seams_seen % self.every == 0:
+            frame = self.canvas.copy()
+            frame[rows, cols] = [0, 0, 255]  # BGR for red
+            self._write_frame(frame)
+
+        # Darken removed pixels for all following frames
+        self.canvas[rows, cols] //= 3
+
+    def _write_frame(self, frame):
+        if self.direction == 'horizontal':
+            frame = frame.transpose(1, 0, 2)
+        frame = np.ascontiguousarray(frame)
+
+        if self.writer is not None:
+            self.writer.write(frame)
+        else:
+            self.gif_frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        self.frames_written += 1
+
+
+def render_seam_heatmap(image, seams, direction='vertical', mode='order',
+                        alpha=0.7):
+    """
+    Renders all removed seams onto the original image in one pass.
+
+    'seams' is a (num_seams, length) array in original coordinates
+    (see SeamHistory). All seams are written with a single vectorized
+    scatter, so the cost does not depend on the number of seams.
+
+    mode='order' colors every removed pixel by its removal order
+    (blue = first, red = last); mode='all' draws every seam in red.
+    """
+    work = image.transpose(1, 0, 2) if direction == 'horizontal' else image
+    order = seam_order_map(seams, work.shape)
+    num_seams = int(order.max()) + 1
+
+    if num_seams == 0:
+        return image.copy()
+
+    removed = order >= 0
+    result = work.copy()
+
+    if mode == 'order':
+        levels = order[removed] * 255 // max(num_seams - 1, 1)
+        colors = cv2.applyColorMap(
+            levels.astype(np.uint8).reshape(-1, 1), cv2.COLORMAP_JET
+        ).reshape(-1, 3)
+    else:  # all
+        colors = np.array([0, 0, 255], dtype=np.uint8)  # BGR for red
+
+    blended = alpha * colors + (1 - alpha) * work[removed]
+    result[removed] = blended.astype(np.uint8)
+
+    if direction == 'horizontal':
+        result = np.ascontiguousarray(result.transpose(1, 0, 2))
+    return result